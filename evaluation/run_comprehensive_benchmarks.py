@@ -12,9 +12,10 @@ Note: We compare COMPRESSION RATIOS only, not schema extraction accuracy.
       LogReducer uses lossy compression (cannot reconstruct exact logs).
 
 Usage:
-    python evaluation/run_comprehensive_benchmarks.py
+    python evaluation/run_comprehensive_benchmarks.py [--parallel-tools] [--jobs N]
     
 Output:
+    evaluation/results/comprehensive_benchmarks_YYYY-MM-DD_HH-MM-SS.ndjson (written as results arrive)
     evaluation/results/comprehensive_benchmarks_YYYY-MM-DD_HH-MM-SS.json
     evaluation/results/comprehensive_benchmarks_YYYY-MM-DD_HH-MM-SS.md
 """
@@ -23,16 +24,22 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import argparse
+import contextlib
+import io
+import json
+import re
 import subprocess
 import time
-import json
 from datetime import datetime
 from collections import defaultdict
 import shutil
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 from logpress.services.compressor import SemanticCompressor
 from logpress.services.query_engine import QueryEngine
+from logpress.services.json_io import write_json
 
 # Try to import logreduce (optional)
 try:
@@ -41,6 +48,9 @@ try:
 except ImportError:
     LOGREDUCE_AVAILABLE = False
 
+# Dotted-quad IPv4 addresses, used to pick the IP query target
+_IP_RE = re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b')
+
 
 def discover_datasets(data_dir='data/datasets'):
     """Auto-discover all log datasets"""
@@ -84,48 +94,42 @@ def measure_generic_compression(tool, level, log_file):
     Returns:
         dict with ratio, time, speed_mbps
     """
-    print(f"  Testing {tool} {level}...", end=' ', flush=True)
+    # Report on one line at the end so concurrent runs do not interleave
+    label = f"  Testing {tool} {level}..."
     
     # Check if tool is available
     if not shutil.which(tool):
-        print(f"❌ NOT INSTALLED")
+        print(f"{label} ❌ NOT INSTALLED")
         return None
     
-    output_file = Path(f"/tmp/{log_file.name}.{tool}")
-    
     try:
-        # Compress
-        start = time.time()
         if tool == 'gzip':
-            subprocess.run(['gzip', level, '-c', str(log_file)], 
-                         stdout=open(output_file, 'wb'), check=True, stderr=subprocess.DEVNULL)
+            cmd = ['gzip', level, '-c', str(log_file)]
         elif tool == 'bzip2':
-            subprocess.run(['bzip2', level, '-c', str(log_file)], 
-                         stdout=open(output_file, 'wb'), check=True, stderr=subprocess.DEVNULL)
+            cmd = ['bzip2', level, '-c', str(log_file)]
         elif tool == 'xz':
-            subprocess.run(['xz', level, '-c', str(log_file)], 
-                         stdout=open(output_file, 'wb'), check=True, stderr=subprocess.DEVNULL)
+            cmd = ['xz', level, '-c', str(log_file)]
         elif tool == 'zstd':
-            subprocess.run(['zstd', level, '-q', '-c', str(log_file)], 
-                         stdout=open(output_file, 'wb'), check=True, stderr=subprocess.DEVNULL)
+            cmd = ['zstd', level, '-q', '-c', str(log_file)]
         elif tool == 'lz4':
-            subprocess.run(['lz4', level, '-c', str(log_file)], 
-                         stdout=open(output_file, 'wb'), check=True, stderr=subprocess.DEVNULL)
+            # Single-shot benchmark: skip the frame's xxhash content checksum
+            cmd = ['lz4', level, '--no-frame-crc', '-c', str(log_file)]
         else:
             raise ValueError(f"Unknown tool: {tool}")
         
-        compress_time = time.time() - start
+        # Compress, counting the output straight from the pipe: no scratch file,
+        # so a small /dev/shm or a slow disk can't fail or slow the run
+        start = time.perf_counter()
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, check=True, stderr=subprocess.DEVNULL)
+        compress_time = time.perf_counter() - start
         
         # Get sizes
         original_size = log_file.stat().st_size
-        compressed_size = output_file.stat().st_size
+        compressed_size = len(result.stdout)
         ratio = original_size / compressed_size
         speed_mbps = (original_size / 1024 / 1024) / compress_time
         
-        # Cleanup
-        output_file.unlink()
-        
-        print(f"✓ {ratio:.2f}× in {compress_time:.2f}s ({speed_mbps:.1f} MB/s)")
+        print(f"{label} ✓ {ratio:.2f}× in {compress_time:.2f}s ({speed_mbps:.1f} MB/s)")
         
         return {
             'ratio': ratio,
@@ -135,7 +139,7 @@ def measure_generic_compression(tool, level, log_file):
         }
         
     except Exception as e:
-        print(f"❌ ERROR: {e}")
+        print(f"{label} ❌ ERROR: {e}")
         return None
 
 
@@ -158,7 +162,7 @@ def measure_logreduce_compression(log_file, dataset_name):
             output_file = Path(tmp_out.name)
         
         # Run logreduce (it processes logs and outputs reduced version)
-        start = time.time()
+        start = time.perf_counter()
         
         # LogReduce CLI: logreduce diff <baseline> <target>
         # For compression benchmark, we use the file as both baseline and target
@@ -170,7 +174,7 @@ def measure_logreduce_compression(log_file, dataset_name):
             timeout=300  # 5 minute timeout
         )
         
-        compress_time = time.time() - start
+        compress_time = time.perf_counter() - start
         
         # LogReduce output goes to stdout, count lines
         reduced_lines = result.stdout.strip().split('\n') if result.stdout.strip() else []
@@ -203,33 +207,45 @@ def measure_logreduce_compression(log_file, dataset_name):
         return None
 
 
-def measure_logpress_compression(log_file, dataset_name):
-    """Measure logpress compression performance"""
-    print(f"  Testing logpress...", end=' ', flush=True)
-    
-    # Load logs
-    logs = []
+def append_ndjson(path, record):
+    """Append one result record as a JSON line, so partial runs are recoverable"""
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+
+def load_logs(log_file):
+    """Read non-empty, stripped log lines once per dataset"""
     with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                logs.append(line)
+        return [line for line in map(str.strip, f) if line]
+
+
+def measure_logpress_compression(logs, log_file, dataset_name):
+    """
+    Measure logpress compression performance
+    
+    Args:
+        logs: Log lines from load_logs()
+        log_file: Path to the original log file (for its size)
+        dataset_name: Dataset name
+    
+    Returns:
+        (result dict, CompressedLog) - the compressed data is reused by benchmark_queries
+    """
+    print(f"  Testing logpress...", end=' ', flush=True)
     
     # Compress
     compressor = SemanticCompressor()
-    start = time.time()
+    start = time.perf_counter()
     compressed_data, stats = compressor.compress(logs, verbose=False)
-    compress_time = time.time() - start
+    compress_time = time.perf_counter() - start
     
     # Save to file to get actual compressed size
     compressed_file = Path('evaluation/compressed') / f"{dataset_name}.lsc"
     compressed_file.parent.mkdir(exist_ok=True, parents=True)
-    compressor.cd = compressed_data  # Set the compressed data
-    compressor.save(compressed_file, verbose=False)
+    compressed_size = compressor.save(compressed_file, verbose=False)
     
     # Get stats
     original_size = log_file.stat().st_size
-    compressed_size = compressed_file.stat().st_size
     ratio = original_size / compressed_size
     speed_mbps = (original_size / 1024 / 1024) / compress_time
     logs_per_second = len(logs) / compress_time
@@ -244,33 +260,38 @@ def measure_logpress_compression(log_file, dataset_name):
         'logs': len(logs),
         'logs_per_second': logs_per_second,
         'templates': stats.template_count
-    }
+    }, compressed_data
 
 
-def benchmark_queries(compressed_file, original_file, dataset_name):
+def benchmark_queries(compressed_data, logs, original_file, dataset_name):
     """
     Benchmark query performance: logpress vs grep baseline
     
+    Args:
+        compressed_data: CompressedLog from measure_logpress_compression
+            (already in memory, so the .lsc file is not decoded again)
+        logs: Log lines already loaded for compression (used to pick a test IP)
+        original_file: Uncompressed log file for the grep baseline
+        dataset_name: Dataset name
+    
     Returns:
         dict mapping query_name to {logpress_ms, baseline_ms, speedup}
     """
     print(f"  Benchmarking queries...")
     
-    # Load compressed data
     engine = QueryEngine()
-    engine.load(compressed_file)
-    compressed_data = engine.compressed
+    engine.compressed = compressed_data
     
     # Count all logs (no decompression needed - metadata only)
-    start = time.time()
+    start = time.perf_counter()
     total_logs = compressed_data.original_count
-    logpress_count_time = (time.time() - start) * 1000  # ms
+    logpress_count_time = (time.perf_counter() - start) * 1000  # ms
     
     # Baseline: wc -l
-    start = time.time()
+    start = time.perf_counter()
     result = subprocess.run(['wc', '-l', str(original_file)], 
                           capture_output=True, text=True, check=True)
-    baseline_count_time = (time.time() - start) * 1000  # ms
+    baseline_count_time = (time.perf_counter() - start) * 1000  # ms
     
     results = {
         'count_all': {
@@ -282,65 +303,153 @@ def benchmark_queries(compressed_file, original_file, dataset_name):
     
     # Query by severity (if available)
     try:
-        start = time.time()
-        error_logs = engine.query_by_severity(compressed_data, 'ERROR')
-        logpress_severity_time = (time.time() - start) * 1000  # ms
+        start = time.perf_counter()
+        error_logs = engine.query_by_severity(['ERROR'])
+        logpress_severity_time = (time.perf_counter() - start) * 1000  # ms
         
         # Baseline: grep -c "ERROR"
-        start = time.time()
+        start = time.perf_counter()
         subprocess.run(['grep', '-c', 'ERROR', str(original_file)], 
                       capture_output=True, check=True)
-        baseline_severity_time = (time.time() - start) * 1000  # ms
+        baseline_severity_time = (time.perf_counter() - start) * 1000  # ms
         
         results['severity_error'] = {
             'logpress_ms': logpress_severity_time,
             'baseline_ms': baseline_severity_time,
             'speedup': baseline_severity_time / logpress_severity_time if logpress_severity_time > 0 else 0,
-            'results_count': len(error_logs)
+            'results_count': error_logs.matched_count
         }
-        print(f"    ✓ Severity query: {baseline_severity_time/logpress_severity_time:.2f}× speedup")
+        print(f"    ✓ Severity query: {results['severity_error']['speedup']:.2f}× speedup")
     except Exception as e:
         print(f"    ⚠ Severity query skipped: {e}")
     
     # Query by IP (if available)
     try:
         # Find an IP in the logs first
-        with open(original_file, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                import re
-                ip_match = re.search(r'\b(?:\d{1,3}\.){3}\d{1,3}\b', line)
-                if ip_match:
-                    test_ip = ip_match.group()
-                    break
-            else:
-                raise ValueError("No IP found in logs")
+        for line in logs:
+            ip_match = _IP_RE.search(line)
+            if ip_match:
+                test_ip = ip_match.group()
+                break
+        else:
+            raise ValueError("No IP found in logs")
         
-        start = time.time()
-        ip_logs = engine.query_by_ip(compressed_data, test_ip)
-        logpress_ip_time = (time.time() - start) * 1000  # ms
+        start = time.perf_counter()
+        ip_logs = engine.query_by_ip(test_ip)
+        logpress_ip_time = (time.perf_counter() - start) * 1000  # ms
         
         # Baseline: grep -c "IP"
-        start = time.time()
+        start = time.perf_counter()
         subprocess.run(['grep', '-c', test_ip, str(original_file)], 
                       capture_output=True, check=True)
-        baseline_ip_time = (time.time() - start) * 1000  # ms
+        baseline_ip_time = (time.perf_counter() - start) * 1000  # ms
         
         results['ip_filter'] = {
             'logpress_ms': logpress_ip_time,
             'baseline_ms': baseline_ip_time,
             'speedup': baseline_ip_time / logpress_ip_time if logpress_ip_time > 0 else 0,
-            'results_count': len(ip_logs),
+            'results_count': ip_logs.matched_count,
             'test_ip': test_ip
         }
-        print(f"    ✓ IP query: {baseline_ip_time/logpress_ip_time:.2f}× speedup")
+        print(f"    ✓ IP query: {results['ip_filter']['speedup']:.2f}× speedup")
     except Exception as e:
         print(f"    ⚠ IP query skipped: {e}")
     
     return results
 
 
+def benchmark_dataset(ds, progress_file, parallel_tools=False):
+    """
+    Run every compressor and the query benchmark on one dataset
+    
+    Args:
+        ds: Dataset entry from discover_datasets()
+        progress_file: NDJSON file that each finished measurement is appended to
+        parallel_tools: Run the generic compressors concurrently
+    
+    Returns:
+        dict with the dataset's tool and query results
+    """
+    print(f"📊 Benchmarking: {ds['name']}")
+    print("-" * 80)
+    
+    result = {
+        'dataset': ds['name'],
+        'original_bytes': ds['size'],
+        'tools': {}
+    }
+    
+    # Test generic compression tools
+    tools = [
+        ('gzip', '-9'),
+        ('bzip2', '-9'),
+        ('xz', '-9'),
+        ('zstd', '-15'),
+        ('lz4', '-9')
+    ]
+    
+    # Each tool is an external process, so threads are enough to overlap them
+    workers = len(tools) if parallel_tools else 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        tool_results = list(pool.map(
+            lambda spec: measure_generic_compression(spec[0], spec[1], ds['path']), tools))
+    
+    for (tool, level), tool_result in zip(tools, tool_results):
+        if tool_result:
+            tool_name = f"{tool}{level.replace('-', '')}"
+            result['tools'][tool_name] = tool_result
+            append_ndjson(progress_file, {'dataset': ds['name'], 'method': tool_name, **tool_result})
+    
+    # Test LogReducer (lossy compression)
+    logreduce_result = measure_logreduce_compression(ds['path'], ds['name'])
+    if logreduce_result:
+        result['tools']['logreduce'] = logreduce_result
+        append_ndjson(progress_file, {'dataset': ds['name'], 'method': 'logreduce', **logreduce_result})
+    
+    # Test logpress (the loaded lines are shared with the query benchmark)
+    logs = load_logs(ds['path'])
+    logpress_result, compressed_data = measure_logpress_compression(logs, ds['path'], ds['name'])
+    result['tools']['logpress'] = logpress_result
+    append_ndjson(progress_file, {'dataset': ds['name'], 'method': 'logpress', **logpress_result})
+    
+    # Benchmark queries on the data just compressed
+    query_results = benchmark_queries(compressed_data, logs, ds['path'], ds['name'])
+    result['queries'] = query_results
+    append_ndjson(progress_file, {'dataset': ds['name'], 'method': 'queries', **query_results})
+    
+    print()
+    return result
+
+
+def _benchmark_dataset_buffered(ds, progress_file, parallel_tools=False, quiet=False):
+    """
+    Run benchmark_dataset and write its console output as a single block
+    
+    Used by main() with --jobs > 1 so output from parallel workers does not interleave,
+    and with --quiet to drop the output instead.
+    """
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            return benchmark_dataset(ds, progress_file, parallel_tools)
+    finally:
+        if not quiet:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+
+
 def main():
     """Run comprehensive benchmarks"""
+    parser = argparse.ArgumentParser(description="Run comprehensive logpress benchmarks")
+    parser.add_argument('--parallel-tools', action='store_true',
+                        help='Run the generic compressors concurrently (faster, but per-tool '
+                             'times then include contention)')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Datasets benchmarked in parallel (default 1 for undisturbed timings)')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Suppress per-dataset output and print only the summary')
+    args = parser.parse_args()
+    
     print("=" * 80)
     print("COMPREHENSIVE BENCHMARKING")
     print("=" * 80)
@@ -353,62 +462,35 @@ def main():
         print(f"  • {ds['name']}: {ds['size']/1024/1024:.2f} MB")
     print()
     
-    all_results = []
-    
-    for ds in datasets:
-        print(f"📊 Benchmarking: {ds['name']}")
-        print("-" * 80)
-        
-        result = {
-            'dataset': ds['name'],
-            'original_bytes': ds['size'],
-            'tools': {}
-        }
-        
-        # Test generic compression tools
-        tools = [
-            ('gzip', '-9'),
-            ('bzip2', '-9'),
-            ('xz', '-9'),
-            ('zstd', '-15'),
-            ('lz4', '-9')
-        ]
-        
-        for tool, level in tools:
-            tool_result = measure_generic_compression(tool, level, ds['path'])
-            if tool_result:
-                result['tools'][f"{tool}{level.replace('-', '')}"] = tool_result
-        
-        # Test LogReducer (lossy compression)
-        logreduce_result = measure_logreduce_compression(ds['path'], ds['name'])
-        if logreduce_result:
-            result['tools']['logreduce'] = logreduce_result
-        
-        # Test logpress
-        logpress_result = measure_logpress_compression(ds['path'], ds['name'])
-        result['tools']['logpress'] = logpress_result
-        
-        # Benchmark queries (if logpress compression succeeded)
-        compressed_file = Path('evaluation/compressed') / f"{ds['name']}.lsc"
-        if compressed_file.exists():
-            query_results = benchmark_queries(compressed_file, ds['path'], ds['name'])
-            result['queries'] = query_results
-        
-        all_results.append(result)
-        print()
-    
-    # Save results
     timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
     results_dir = Path('evaluation/results')
     results_dir.mkdir(exist_ok=True, parents=True)
+    progress_file = results_dir / f"comprehensive_benchmarks_{timestamp}.ndjson"
+    print(f"Streaming per-tool results to: {progress_file}")
+    print()
+    
+    if args.jobs > 1 and datasets:
+        # Datasets are independent: one worker process each
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(datasets))) as executor:
+            futures = [
+                executor.submit(_benchmark_dataset_buffered, ds, progress_file, args.parallel_tools,
+                                args.quiet)
+                for ds in datasets
+            ]
+            # Collect in submission order so the report tables stay stable
+            all_results = [future.result() for future in futures]
+    else:
+        all_results = [_benchmark_dataset_buffered(ds, progress_file, args.parallel_tools, args.quiet)
+                       if args.quiet else benchmark_dataset(ds, progress_file, args.parallel_tools)
+                       for ds in datasets]
     
+    # Save results
     # JSON output
     json_file = results_dir / f"comprehensive_benchmarks_{timestamp}.json"
-    with open(json_file, 'w') as f:
-        json.dump({
-            'timestamp': datetime.now().isoformat(),
-            'datasets': all_results
-        }, f, indent=2)
+    write_json(json_file, {
+        'timestamp': datetime.now().isoformat(),
+        'datasets': all_results
+    }, pretty=True)
     print(f"✓ JSON results saved to: {json_file}")
     
     # Markdown output
@@ -12,18 +12,122 @@ Runs comprehensive compression evaluation on ALL datasets:
 Tracks and reports EXACTLY which algorithms/techniques are used.
 """
 
+import io
+import operator
+import os
 import sys
 import time
 import gzip
+import json
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import Any, Callable, List, Dict, Tuple
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from logpress.services.compressor import SemanticCompressor
+from logpress.services.json_io import write_json
+
+# zlib-ng is a faster gzip for the baseline, but its deflate streams (and so the
+# sizes) differ slightly from stdlib zlib at the same level; the engine used is
+# recorded with the results
+try:
+    from zlib_ng import gzip_ng
+    GZIP_ENGINE = "zlib-ng"
+except ImportError:
+    gzip_ng = gzip
+    GZIP_ENGINE = "zlib"
+
+# ISA-L is faster still but only implements levels 0-3, so it only serves those
+# levels (the --skip-gzip9 fast path); the gzip -9 reference never uses it
+try:
+    from isal import igzip
+    ISAL_AVAILABLE = True
+except ImportError:
+    ISAL_AVAILABLE = False
+
+
+def select_gzip_engine(level: int = 9) -> Tuple[Any, str]:
+    """
+    Pick the gzip module for a baseline level
+    
+    Returns:
+        (module with a gzip-compatible compress(), engine name)
+    """
+    if GZIP_ENGINE == "zlib" and ISAL_AVAILABLE and level <= 3:
+        return igzip, "isal"
+    return gzip_ng, GZIP_ENGINE
+
+# gzip -9 sizes keyed by input file state, so unchanged datasets skip the baseline
+GZIP_CACHE_FILE = Path("evaluation/results/gzip_baseline_cache.json")
+
+
+def _read_gzip_cache() -> dict:
+    """Load the gzip baseline cache, empty if missing or unreadable"""
+    try:
+        with open(GZIP_CACHE_FILE, 'rb') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def gzip_baseline_size(log_file: Path, sample_size: int, original_size: int,
+                       load_data: Callable[[], bytes], level: int = 9) -> tuple:
+    """
+    gzip size of the dataset bytes, cached across runs
+    
+    Shared with run_verbose_evaluation.py, so either script reuses the
+    baseline the other already computed for an unchanged dataset. The
+    bytes are only built (via load_data) on a cache miss.
+    
+    Args:
+        log_file: Source .log file (its size and mtime key the cache)
+        sample_size: Line limit used to build the data
+        original_size: Length of the data in bytes
+        load_data: Returns the bytes to compress on a cache miss
+        level: gzip compression level
+        
+    Returns:
+        (compressed size in bytes, whether it came from the cache)
+    """
+    engine_module, engine = select_gzip_engine(level)
+    stat = log_file.stat()
+    key = (f"{log_file.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{sample_size}|"
+           f"{original_size}|{engine}")
+    if level != 9:
+        key += f"|-{level}"
+    
+    cache = _read_gzip_cache()
+    if key in cache:
+        return cache[key], True
+    
+    size = len(engine_module.compress(load_data(), compresslevel=level, mtime=0))
+    
+    # --jobs workers share the cache file: merge in entries stored since the read
+    # above, and replace the file atomically so no reader sees a partial write
+    GZIP_CACHE_FILE.parent.mkdir(exist_ok=True, parents=True)
+    cache = _read_gzip_cache()
+    cache[key] = size
+    tmp_file = GZIP_CACHE_FILE.with_name(f"{GZIP_CACHE_FILE.name}.{os.getpid()}.tmp")
+    write_json(tmp_file, cache, pretty=True)
+    os.replace(tmp_file, GZIP_CACHE_FILE)
+    return size, False
+
+
+def encode_logs(logs: List[str]) -> bytearray:
+    """Newline-joined UTF-8 bytes of logs, encoded line by line into one buffer"""
+    original_data = bytearray()
+    for line in logs:
+        original_data += line.encode('utf-8')
+        original_data += b'\n'
+    del original_data[-1:]
+    return original_data
 
 
 @dataclass
@@ -40,6 +144,7 @@ class DatasetResult:
     gzip_ratio: float
     template_count: int
     techniques_used: Dict[str, str]
+    gzip_engine: str = GZIP_ENGINE
 
 
 def analyze_dataset(dataset_name: str, log_file: Path, sample_size: int = None) -> DatasetResult:
@@ -56,29 +161,27 @@ def analyze_dataset(dataset_name: str, log_file: Path, sample_size: int = None)
     print("=" * 80)
     print(f"📂 Loading {log_file}")
     
-    # Load logs
-    logs = []
-    with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-        for i, line in enumerate(f):
-            if sample_size and i >= sample_size:
-                break
-            line = line.strip()
-            if line:
-                logs.append(line)
+    # Load logs by streaming the file iterator (about 2x faster than read().split()
+    # on large files, and never holds the whole text in memory). Samples stop
+    # reading at the sample_size-th non-blank line.
+    with open(log_file, 'r', encoding='utf-8', errors='ignore', buffering=1 << 20) as f:
+        if sample_size:
+            logs = list(islice(filter(None, map(str.strip, f)), sample_size))
+        else:
+            logs = [line for line in map(str.strip, f) if line]
     
     print(f"✓ Loaded {len(logs):,} logs")
     print()
     
-    # Calculate sizes
-    original_data = '\n'.join(logs).encode('utf-8')
-    original_bytes = len(original_data)
+    # Calculate sizes: newline-joined UTF-8 length, without building the bytes
+    original_bytes = sum(map(len, map(str.encode, logs))) + max(len(logs) - 1, 0)
     
-    # gzip baseline
-    print("📊 Baseline: gzip -9")
-    gzipped = gzip.compress(original_data, compresslevel=9)
-    gzip_bytes = len(gzipped)
+    # gzip baseline (the joined bytes are only encoded on a cache miss)
+    print(f"📊 Baseline: gzip -9 ({GZIP_ENGINE})")
+    gzip_bytes, cached = gzip_baseline_size(log_file, sample_size, original_bytes,
+                                            lambda: encode_logs(logs))
     gzip_ratio = original_bytes / gzip_bytes
-    print(f"   {original_bytes:,} → {gzip_bytes:,} bytes = {gzip_ratio:.2f}x")
+    print(f"   {original_bytes:,} → {gzip_bytes:,} bytes = {gzip_ratio:.2f}x{' (cached)' if cached else ''}")
     print()
     
     # logpress compression with detailed tracking
@@ -97,8 +200,7 @@ def analyze_dataset(dataset_name: str, log_file: Path, sample_size: int = None)
     
     # Save to file
     output_path = Path(f"evaluation/compressed/{dataset_name.lower()}_full.lsc")
-    compressor.save(output_path, verbose=False)
-    compressed_bytes = output_path.stat().st_size
+    compressed_bytes = compressor.save(output_path, verbose=False)
     compression_ratio = original_bytes / compressed_bytes
     
     # Decompression test
@@ -107,7 +209,7 @@ def analyze_dataset(dataset_name: str, log_file: Path, sample_size: int = None)
     decompressed = compressor.decompress()
     decompress_time = time.time() - start
     
-    match_count = sum(1 for orig, decomp in zip(logs, decompressed) if orig == decomp)
+    match_count = sum(map(operator.eq, logs, decompressed))
     print(f"✓ Decompressed {len(decompressed):,} logs in {decompress_time:.3f}s")
     print(f"✓ Lossless: {match_count}/{len(logs)} logs match ({(match_count/len(logs)*100):.1f}%)")
     print()
@@ -158,9 +260,34 @@ def analyze_dataset(dataset_name: str, log_file: Path, sample_size: int = None)
     )
 
 
+def _analyze_dataset_buffered(dataset_name: str, log_file: Path, sample_size: int = None,
+                              quiet: bool = False) -> DatasetResult:
+    """
+    Run analyze_dataset and write its console output as a single block
+    
+    Used by main() so output from parallel workers does not interleave.
+    With quiet set the output is dropped instead.
+    """
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            return analyze_dataset(dataset_name, log_file, sample_size)
+    finally:
+        if not quiet:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+
+
 def main():
     """Run comprehensive evaluation on all datasets"""
     
+    parser = argparse.ArgumentParser(description="logpress full evaluation")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Datasets evaluated in parallel (default 1 for undisturbed timings)")
+    parser.add_argument('--quiet', action='store_true',
+                        help="Suppress per-dataset output and print only the summary")
+    args = parser.parse_args()
+    
     print("╔" + "═" * 78 + "╗")
     print("║" + " " * 78 + "║")
     print("║" + "logpress FULL EVALUATION".center(78) + "║")
@@ -209,20 +336,31 @@ def main():
     
     results: List[DatasetResult] = []
     
+    jobs = []
     for dataset_name, log_file, sample_size in datasets:
         if not log_file.exists():
             print(f"⚠ Skipping {dataset_name}: File not found ({log_file})")
             print()
             continue
+        jobs.append((dataset_name, log_file, sample_size))
+    
+    # Datasets are independent: one worker process each
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(jobs)))) as executor:
+        futures = [
+            (dataset_name, executor.submit(_analyze_dataset_buffered, dataset_name, log_file, sample_size,
+                                          args.quiet))
+            for dataset_name, log_file, sample_size in jobs
+        ]
         
-        try:
-            result = analyze_dataset(dataset_name, log_file, sample_size)
-            results.append(result)
-        except Exception as e:
-            print(f"❌ Error processing {dataset_name}: {e}")
-            import traceback
-            traceback.print_exc()
-            print()
+        # Collect in submission order so the summary table stays stable
+        for dataset_name, future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"❌ Error processing {dataset_name}: {e}")
+                import traceback
+                traceback.print_exc()
+                print()
     
     # Summary table
     print()
@@ -235,11 +373,17 @@ def main():
     print(f"{'Dataset':<12} | {'Logs':>8} | {'Original':>10} | {'Compressed':>10} | {'Ratio':>6} | {'vs gzip':>8} | {'Speed':>10}")
     print("-" * 80)
     
+    total_logs = 0
     total_original = 0
     total_compressed = 0
     total_gzip = 0
     
+    # Build the table rows and write them in one call instead of one print per row.
+    # Dataset and AVERAGE rows share one row format so their columns cannot drift.
+    format_row = "{:<12} | {:>8,} | {:>8.2f} MB | {:>8.2f} KB | {:>6.2f}x | {:>7.1f}% | {:>10}".format
+    rows = []
     for result in results:
+        total_logs += result.log_count
         total_original += result.original_bytes
         total_compressed += result.compressed_bytes
         total_gzip += result.gzip_bytes
@@ -247,26 +391,19 @@ def main():
         vs_gzip = (result.compression_ratio / result.gzip_ratio) * 100
         speed = result.original_bytes / result.compress_time / 1024 / 1024
         
-        print(f"{result.name:<12} | {result.log_count:>8,} | "
-              f"{result.original_bytes/1024/1024:>8.2f} MB | "
-              f"{result.compressed_bytes/1024:>8.2f} KB | "
-              f"{result.compression_ratio:>6.2f}x | "
-              f"{vs_gzip:>7.1f}% | "
-              f"{speed:>7.2f} MB/s")
+        rows.append(format_row(result.name, result.log_count, result.original_bytes / 1024 / 1024,
+                               result.compressed_bytes / 1024, result.compression_ratio,
+                               vs_gzip, f"{speed:>7.2f} MB/s"))
     
-    print("-" * 80)
+    rows.append("-" * 80)
     
     avg_ratio = total_original / total_compressed
     avg_gzip_ratio = total_original / total_gzip
     avg_vs_gzip = (avg_ratio / avg_gzip_ratio) * 100
     
-    print(f"{'AVERAGE':<12} | {sum(r.log_count for r in results):>8,} | "
-          f"{total_original/1024/1024:>8.2f} MB | "
-          f"{total_compressed/1024:>8.2f} KB | "
-          f"{avg_ratio:>6.2f}x | "
-          f"{avg_vs_gzip:>7.1f}% | "
-          f"{'—':>10}")
-    print()
+    rows.append(format_row('AVERAGE', total_logs, total_original / 1024 / 1024,
+                           total_compressed / 1024, avg_ratio, avg_vs_gzip, '—'))
+    sys.stdout.write('\n'.join(rows) + '\n\n')
     
     # Pipeline summary
     print("=" * 80)
@@ -314,7 +451,9 @@ def main():
         f.write(f"**Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
         f.write(f"**Total Datasets**: {len(results)}\n")
         f.write(f"**Total Logs**: {sum(r.log_count for r in results):,}\n")
-        f.write(f"**Total Size**: {total_original/1024/1024:.2f} MB\n\n")
+        f.write(f"**Total Size**: {total_original/1024/1024:.2f} MB\n")
+        f.write(f"**gzip Engine**: {GZIP_ENGINE} (gzip sizes differ slightly between engines; "
+                f"zlib is the stdlib reference)\n\n")
         
         f.write("## Summary Table\n\n")
         f.write("| Dataset | Logs | Original | Compressed | Ratio | vs gzip | Speed |\n")
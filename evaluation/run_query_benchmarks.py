@@ -6,19 +6,32 @@ Tests selective decompression performance against full decompression baseline.
 Measures speedup achieved by columnar access and predicate pushdown.
 """
 
+import argparse
+import contextlib
+import gc
+import io
+import re
 import sys
 import time
 import gzip
-import json
+import statistics
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Any
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 
 # Ensure project root is on sys.path so imports like `logpress.*` work
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from logpress.services.query_engine import QueryEngine
+from logpress.services.json_io import write_json
+
+# Timed runs per query; median and p95 are reported
+QUERY_RUNS = 11
+
+# Dotted-quad IPv4 addresses, compiled once for the target IP scan
+_IP_RE = re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b')
 
 
 @dataclass
@@ -33,6 +46,41 @@ class QueryBenchmark:
     total_rows: int
     bytes_decompressed: int
     total_bytes: int
+    logpress_p95_ms: float = 0.0
+    baseline_p95_ms: float = 0.0
+    logpress_samples_ms: List[float] = field(default_factory=list)
+    baseline_samples_ms: List[float] = field(default_factory=list)
+
+
+def _time_runs(func, runs: int = QUERY_RUNS):
+    """
+    Time repeated calls of func
+    
+    Like timeit, the garbage collector is paused while timing so a collection
+    triggered by earlier allocations does not land in one run's sample.
+    
+    Returns:
+        (last result, list of run times in ms)
+    """
+    times = []
+    result = None
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = func()
+            times.append((time.perf_counter() - start) * 1000)  # Convert to ms
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return result, times
+
+
+def _p95(times: List[float]) -> float:
+    """95th percentile (nearest rank) of run times"""
+    ordered = sorted(times)
+    return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
 
 
 def benchmark_query(query_engine: QueryEngine, query_name: str, query_desc: str,
@@ -50,34 +98,23 @@ def benchmark_query(query_engine: QueryEngine, query_name: str, query_desc: str,
     print(f"  Testing: {query_name}")
     print(f"    {query_desc}")
     
-    # Warm-up run
+    # Warm-up runs (first call pays one-off setup, not query cost)
     _ = query_func(query_engine)
+    _ = baseline_func()
     
-    # logpress query (3 runs, take average)
-    logpress_times = []
-    for _ in range(3):
-        start = time.perf_counter()
-        result = query_func(query_engine)
-        end = time.perf_counter()
-        logpress_times.append((end - start) * 1000)  # Convert to ms
-    
-    logpress_time = sum(logpress_times) / len(logpress_times)
+    # logpress query: median of QUERY_RUNS runs
+    result, logpress_times = _time_runs(lambda: query_func(query_engine))
+    logpress_time = statistics.median(logpress_times)
     rows_matched = len(result) if isinstance(result, list) else (result.matched_count if hasattr(result, 'matched_count') else 1)
     
     # Baseline (full decompression + filter)
-    baseline_times = []
-    for _ in range(3):
-        start = time.perf_counter()
-        baseline_result = baseline_func()
-        end = time.perf_counter()
-        baseline_times.append((end - start) * 1000)
-    
-    baseline_time = sum(baseline_times) / len(baseline_times)
+    _, baseline_times = _time_runs(baseline_func)
+    baseline_time = statistics.median(baseline_times)
     
     speedup = baseline_time / logpress_time if logpress_time > 0 else 0
     
-    print(f"    logpress:   {logpress_time:.2f} ms ({rows_matched:,} rows)")
-    print(f"    Baseline: {baseline_time:.2f} ms")
+    print(f"    logpress:   {logpress_time:.2f} ms median, {_p95(logpress_times):.2f} ms p95 ({rows_matched:,} rows)")
+    print(f"    Baseline: {baseline_time:.2f} ms median, {_p95(baseline_times):.2f} ms p95")
     print(f"    Speedup:  {speedup:.1f}x")
     print()
     
@@ -90,7 +127,11 @@ def benchmark_query(query_engine: QueryEngine, query_name: str, query_desc: str,
         rows_matched=rows_matched,
         total_rows=total_rows,
         bytes_decompressed=0,  # TODO: Track bytes
-        total_bytes=0
+        total_bytes=0,
+        logpress_p95_ms=_p95(logpress_times),
+        baseline_p95_ms=_p95(baseline_times),
+        logpress_samples_ms=logpress_times,
+        baseline_samples_ms=baseline_times
     )
 
 
@@ -111,12 +152,8 @@ def benchmark_dataset(dataset_name: str, compressed_file: Path,
     
     # Load original data for baseline
     print(f"📂 Loading original logs for baseline: {original_file}")
-    original_logs = []
-    with open(original_file, 'r', encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                original_logs.append(line)
+    with open(original_file, 'r', encoding='utf-8', errors='ignore', buffering=1 << 20) as f:
+        original_logs = [line for line in map(str.strip, f) if line]
     print(f"✓ Loaded {len(original_logs):,} logs")
     print()
     
@@ -141,7 +178,7 @@ def benchmark_dataset(dataset_name: str, compressed_file: Path,
             "severity_error",
             "SELECT * WHERE severity='error' OR severity='ERROR'",
             lambda qe: qe.query_by_severity(['error', 'ERROR']),
-            lambda: [log for log in original_logs if 'error' in log.lower() or 'ERROR' in log],
+            lambda: [log for log in original_logs if 'error' in log.lower()],
             log_count
         ))
     
@@ -151,9 +188,7 @@ def benchmark_dataset(dataset_name: str, compressed_file: Path,
         # Extract common IP from first 1000 logs
         sample_ips = set()
         for log in original_logs[:1000]:
-            import re
-            ips = re.findall(r'\b(?:\d{1,3}\.){3}\d{1,3}\b', log)
-            sample_ips.update(ips)
+            sample_ips.update(_IP_RE.findall(log))
         
         if sample_ips:
             target_ip = list(sample_ips)[0]
@@ -177,20 +212,41 @@ def benchmark_dataset(dataset_name: str, compressed_file: Path,
     if dataset_name in ['Apache', 'Zookeeper']:
         print("🔍 Query 5: Combined Filter (Severity + Keyword)")
         keyword = "connection" if dataset_name == "Zookeeper" else "notice"
+        keyword_lower = keyword.lower()
         benchmarks.append(benchmark_query(
             query_engine,
             "combined_filter",
             f"SELECT * WHERE severity contains '{keyword}'",
             lambda qe: qe.query_by_severity([keyword]),
-            lambda: [log for log in original_logs if keyword.lower() in log.lower()],
+            lambda: [log for log in original_logs if keyword_lower in log.lower()],
             log_count
         ))
     
     return benchmarks
 
 
+def _benchmark_dataset_buffered(dataset_name: str, compressed_file: Path,
+                                original_file: Path) -> List[QueryBenchmark]:
+    """
+    Run benchmark_dataset and write its console output as a single block
+    
+    Used by main() with --jobs > 1 so output from parallel workers does not interleave.
+    """
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            return benchmark_dataset(dataset_name, compressed_file, original_file)
+    finally:
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+
+
 def main():
     """Run query benchmarks on all compressed datasets"""
+    parser = argparse.ArgumentParser(description="Run logpress query performance benchmarks")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Datasets benchmarked in parallel (default 1 for undisturbed timings)')
+    args = parser.parse_args()
     
     print("╔" + "═" * 78 + "╗")
     print("║" + " " * 78 + "║")
@@ -231,6 +287,7 @@ def main():
     
     all_results = {}
     
+    runnable = []
     for dataset_name, compressed_file, original_file in datasets:
         if not compressed_file.exists():
             print(f"⚠ Skipping {dataset_name}: Compressed file not found ({compressed_file})")
@@ -242,14 +299,35 @@ def main():
             print()
             continue
         
-        try:
-            benchmarks = benchmark_dataset(dataset_name, compressed_file, original_file)
-            all_results[dataset_name] = benchmarks
-        except Exception as e:
-            print(f"❌ Error benchmarking {dataset_name}: {e}")
-            import traceback
-            traceback.print_exc()
-            print()
+        runnable.append((dataset_name, compressed_file, original_file))
+    
+    if args.jobs > 1 and runnable:
+        # Datasets are independent: one worker process each
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(runnable))) as executor:
+            futures = [
+                (dataset_name, executor.submit(_benchmark_dataset_buffered, dataset_name,
+                                               compressed_file, original_file))
+                for dataset_name, compressed_file, original_file in runnable
+            ]
+            # Collect in submission order so the summary table stays stable
+            for dataset_name, future in futures:
+                try:
+                    all_results[dataset_name] = future.result()
+                except Exception as e:
+                    print(f"❌ Error benchmarking {dataset_name}: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    print()
+    else:
+        for dataset_name, compressed_file, original_file in runnable:
+            try:
+                benchmarks = benchmark_dataset(dataset_name, compressed_file, original_file)
+                all_results[dataset_name] = benchmarks
+            except Exception as e:
+                print(f"❌ Error benchmarking {dataset_name}: {e}")
+                import traceback
+                traceback.print_exc()
+                print()
     
     # Summary table
     print()
@@ -298,22 +376,25 @@ def main():
                 'baseline_time_ms': b.baseline_time_ms,
                 'speedup': b.speedup,
                 'rows_matched': b.rows_matched,
-                'total_rows': b.total_rows
+                'total_rows': b.total_rows,
+                'logpress_p95_ms': b.logpress_p95_ms,
+                'baseline_p95_ms': b.baseline_p95_ms,
+                'logpress_samples_ms': b.logpress_samples_ms,
+                'baseline_samples_ms': b.baseline_samples_ms
             }
             for b in benchmarks
         ]
     
-    with open(results_file, 'w') as f:
-        json.dump({
-            'timestamp': datetime.now().isoformat(),
-            'datasets': results_dict,
-            'summary': {
-                'avg_speedup': avg_speedup if all_speedups else 0,
-                'min_speedup': min_speedup if all_speedups else 0,
-                'max_speedup': max_speedup if all_speedups else 0,
-                'total_queries': len(all_speedups)
-            }
-        }, f, indent=2)
+    write_json(results_file, {
+        'timestamp': datetime.now().isoformat(),
+        'datasets': results_dict,
+        'summary': {
+            'avg_speedup': avg_speedup if all_speedups else 0,
+            'min_speedup': min_speedup if all_speedups else 0,
+            'max_speedup': max_speedup if all_speedups else 0,
+            'total_queries': len(all_speedups)
+        }
+    }, pretty=True)
     
     print(f"✓ Results saved to {results_file}")
     print()
@@ -10,14 +10,39 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import io
+import operator
+import os
 import time
-import gzip
+import argparse
+import shutil
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from datetime import datetime
 from logpress.services.compressor import SemanticCompressor
+from logpress.services.json_io import write_json
+from run_full_evaluation import gzip_baseline_size, select_gzip_engine
 
+# Optional multi-threaded gzip for large baselines
+try:
+    import pgzip
+    PGZIP_AVAILABLE = True
+except ImportError:
+    PGZIP_AVAILABLE = False
 
-def evaluate_dataset(name, log_file, max_logs=None):
-    """Evaluate a single dataset with verbose output"""
+
+def evaluate_dataset(name, log_file, max_logs=None, parallel_gzip=False, gzip_level=9):
+    """
+    Evaluate a single dataset with verbose output
+    
+    Args:
+        name: Dataset name
+        log_file: Path to .log file
+        max_logs: Optional limit on number of logs to process
+        parallel_gzip: Compress the gzip baseline with pgzip across all cores
+        gzip_level: gzip baseline level (9 = reference, 1 = fast path)
+    """
     
     print("=" * 80)
     print(f"📊 DATASET: {name}")
@@ -26,20 +51,21 @@ def evaluate_dataset(name, log_file, max_logs=None):
     
     # Load logs
     print(f"📂 Loading logs from: {log_file.name}")
-    logs = []
-    with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-        for i, line in enumerate(f):
-            if max_logs and i >= max_logs:
-                break
-            line = line.strip()
-            if line:
-                logs.append(line)
+    # Work on bytes so the gzip baseline input needs no decode/encode round-trip
+    # Stream the file rather than read_bytes().split(): faster on large files and
+    # samples stop at the max_logs-th non-blank line
+    with open(log_file, 'rb', buffering=1 << 20) as f:
+        if max_logs:
+            raw_lines = list(islice(filter(None, map(bytes.strip, f)), max_logs))
+        else:
+            raw_lines = [line for line in map(bytes.strip, f) if line]
+    logs = [line.decode('utf-8', 'ignore') for line in raw_lines]
     
     print(f"✓ Loaded {len(logs):,} log entries")
     print()
     
     # Original size
-    original_data = '\n'.join(logs).encode('utf-8')
+    original_data = b'\n'.join(raw_lines)
     original_bytes = len(original_data)
     original_mb = original_bytes / 1024 / 1024
     
@@ -47,16 +73,23 @@ def evaluate_dataset(name, log_file, max_logs=None):
     print()
     
     # Baseline: gzip
-    print("🗜️  Baseline compression (gzip -9)...")
+    gzip_threads = (os.cpu_count() or 1) if parallel_gzip and PGZIP_AVAILABLE else 1
+    print(f"🗜️  Baseline compression (gzip -{gzip_level}, {gzip_threads} thread{'s' if gzip_threads > 1 else ''})...")
     gzip_start = time.time()
-    gzipped = gzip.compress(original_data, compresslevel=9)
+    if gzip_threads > 1:
+        gzip_bytes = len(pgzip.compress(original_data, compresslevel=gzip_level,
+                                        thread=gzip_threads, blocksize=2 * 10**7))
+        cached = False
+    else:
+        # Single-threaded sizes are shared with run_full_evaluation.py's cache
+        gzip_bytes, cached = gzip_baseline_size(log_file, max_logs, original_bytes,
+                                                lambda: original_data, gzip_level)
     gzip_time = time.time() - gzip_start
-    gzip_bytes = len(gzipped)
     gzip_ratio = original_bytes / gzip_bytes
     
     print(f"   Size: {gzip_bytes:,} bytes ({gzip_bytes/1024:.2f} KB)")
     print(f"   Ratio: {gzip_ratio:.2f}x")
-    print(f"   Time: {gzip_time:.3f}s")
+    print(f"   Time: {'cached' if cached else f'{gzip_time:.3f}s'}")
     print()
     
     # logpress compression
@@ -86,8 +119,7 @@ def evaluate_dataset(name, log_file, max_logs=None):
     output_path = output_dir / f"{name.lower()}_test.lsc"
     
     print(f"💾 Saving to: {output_path.name}")
-    compressor.save(output_path, verbose=False)
-    compressed_bytes = output_path.stat().st_size
+    compressed_bytes = compressor.save(output_path, verbose=False)
     compressed_kb = compressed_bytes / 1024
     compression_ratio = original_bytes / compressed_bytes
     
@@ -101,8 +133,8 @@ def evaluate_dataset(name, log_file, max_logs=None):
     decompressed = compressor.decompress()
     decompress_time = time.time() - decompress_start
     
-    # Verify
-    matches = sum(1 for o, d in zip(logs, decompressed) if o == d)
+    # Verify (line-by-line equality counted in C, no per-line generator frame)
+    matches = sum(map(operator.eq, logs, decompressed))
     accuracy = (matches / len(logs)) * 100
     
     print(f"✓ Decompressed {len(decompressed):,} logs in {decompress_time:.3f}s")
@@ -118,7 +150,7 @@ def evaluate_dataset(name, log_file, max_logs=None):
     print(f"Log entries:         {len(logs):,}")
     print(f"Original size:       {original_bytes:,} bytes ({original_mb:.2f} MB)")
     print()
-    print(f"gzip-9:              {gzip_bytes:,} bytes ({gzip_ratio:.2f}x)")
+    print(f"gzip-{gzip_level}:              {gzip_bytes:,} bytes ({gzip_ratio:.2f}x)")
     print(f"logpress:              {compressed_bytes:,} bytes ({compression_ratio:.2f}x)")
     print()
     print(f"Improvement:         {(compression_ratio/gzip_ratio)*100:.1f}% of gzip efficiency")
@@ -137,6 +169,9 @@ def evaluate_dataset(name, log_file, max_logs=None):
         'original_bytes': original_bytes,
         'compressed_bytes': compressed_bytes,
         'gzip_bytes': gzip_bytes,
+        'gzip_threads': gzip_threads,
+        'gzip_level': gzip_level,
+        'gzip_engine': select_gzip_engine(gzip_level)[1] if gzip_threads == 1 else 'pgzip',
         'compression_ratio': compression_ratio,
         'gzip_ratio': gzip_ratio,
         'compress_time': compress_time,
@@ -145,9 +180,47 @@ def evaluate_dataset(name, log_file, max_logs=None):
     }
 
 
+def _evaluate_dataset_buffered(name, log_file, max_logs=None, parallel_gzip=False, gzip_level=9,
+                               quiet=False):
+    """
+    Run evaluate_dataset and write its console output as a single block
+    
+    Used by main() with --jobs > 1 so output from parallel workers does not interleave,
+    and with --quiet to drop the output instead.
+    """
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            return evaluate_dataset(name, log_file, max_logs, parallel_gzip, gzip_level)
+    finally:
+        if not quiet:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+
+
 def main():
     """Run verbose evaluation on selected datasets"""
     
+    parser = argparse.ArgumentParser(description="Verbose logpress evaluation")
+    parser.add_argument('--parallel-gzip', action='store_true',
+                        help="Multi-threaded gzip baseline via pgzip (sizes differ slightly from gzip -9)")
+    parser.add_argument('--skip-gzip9', action='store_true',
+                        help="Fast path: use gzip -1 for the baseline instead of gzip -9")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Datasets evaluated in parallel (default 1 keeps live progress output)")
+    parser.add_argument('--quiet', action='store_true',
+                        help="Suppress per-dataset output and print only the summary")
+    args = parser.parse_args()
+    gzip_level = 1 if args.skip_gzip9 else 9
+    
+    if args.jobs > 1 and args.parallel_gzip:
+        # Dataset workers already use the cores; threaded gzip inside them would oversubscribe
+        print("⚠️  --parallel-gzip ignored with --jobs > 1")
+        args.parallel_gzip = False
+    
+    if args.parallel_gzip and not PGZIP_AVAILABLE:
+        print("⚠️  pgzip not installed (pip install pgzip); using single-threaded gzip")
+    
     print()
     print("╔" + "═" * 78 + "╗")
     print("║" + " " * 78 + "║")
@@ -187,22 +260,51 @@ def main():
         test_cases.append((folder_name, log_file, sample))
 
     results = []
-
+    
+    jobs = []
     for name, log_file, max_logs in test_cases:
         if not log_file.exists():
             print(f"⚠️  Skipping {name}: File not found ({log_file})")
             print()
             continue
-        
-        try:
-            result = evaluate_dataset(name, log_file, max_logs)
+        jobs.append((name, log_file, max_logs))
+    
+    if args.jobs > 1 and jobs:
+        # Datasets are independent: one worker process each
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(jobs))) as executor:
+            futures = [
+                (name, executor.submit(_evaluate_dataset_buffered, name, log_file, max_logs,
+                                       args.parallel_gzip, gzip_level, args.quiet))
+                for name, log_file, max_logs in jobs
+            ]
+            # Collect in submission order so the summary table stays stable
+            outcomes = []
+            for name, future in futures:
+                try:
+                    outcomes.append((name, future.result(), None))
+                except Exception as e:
+                    outcomes.append((name, None, e))
+    else:
+        outcomes = []
+        for name, log_file, max_logs in jobs:
+            try:
+                if args.quiet:
+                    result = _evaluate_dataset_buffered(name, log_file, max_logs, args.parallel_gzip,
+                                                        gzip_level, quiet=True)
+                else:
+                    result = evaluate_dataset(name, log_file, max_logs, args.parallel_gzip, gzip_level)
+                outcomes.append((name, result, None))
+            except Exception as e:
+                outcomes.append((name, None, e))
+    
+    for name, result, error in outcomes:
+        if error is None:
             results.append(result)
-        except Exception as e:
-            print(f"❌ Error processing {name}: {e}")
+        else:
+            print(f"❌ Error processing {name}: {error}")
             import traceback
-            traceback.print_exc()
+            traceback.print_exception(error)
             print()
-            continue
     
     # Final summary
     if results:
@@ -214,34 +316,32 @@ def main():
         print(f"{'Dataset':<12} | {'Logs':>10} | {'Original':>10} | {'Compressed':>10} | {'Ratio':>7} | {'vs gzip':>8}")
         print("-" * 80)
         
-        total_original = sum(r['original_bytes'] for r in results)
-        total_compressed = sum(r['compressed_bytes'] for r in results)
-        total_gzip = sum(r['gzip_bytes'] for r in results)
+        # Accumulate all totals in the same pass that prints the per-dataset rows.
+        # Dataset and AVERAGE rows share one row format so their columns cannot drift.
+        format_row = "{:<12} | {:>10,} | {:>8.2f} MB | {:>8.2f} KB | {:>6.2f}x | {:>7.1f}%".format
+        total_logs = total_original = total_compressed = total_gzip = 0
         
         for r in results:
+            total_logs += r['logs']
+            total_original += r['original_bytes']
+            total_compressed += r['compressed_bytes']
+            total_gzip += r['gzip_bytes']
             vs_gzip = (r['compression_ratio'] / r['gzip_ratio']) * 100
-            print(f"{r['name']:<12} | {r['logs']:>10,} | "
-                  f"{r['original_bytes']/1024/1024:>8.2f} MB | "
-                  f"{r['compressed_bytes']/1024:>8.2f} KB | "
-                  f"{r['compression_ratio']:>6.2f}x | "
-                  f"{vs_gzip:>7.1f}%")
+            print(format_row(r['name'], r['logs'], r['original_bytes'] / 1024 / 1024,
+                             r['compressed_bytes'] / 1024, r['compression_ratio'], vs_gzip))
         
         print("-" * 80)
         avg_ratio = total_original / total_compressed
         avg_gzip = total_original / total_gzip
         avg_vs_gzip = (avg_ratio / avg_gzip) * 100
+        gzip_engines = ", ".join(sorted({r['gzip_engine'] for r in results}))
         
-        print(f"{'AVERAGE':<12} | {sum(r['logs'] for r in results):>10,} | "
-              f"{total_original/1024/1024:>8.2f} MB | "
-              f"{total_compressed/1024:>8.2f} KB | "
-              f"{avg_ratio:>6.2f}x | "
-              f"{avg_vs_gzip:>7.1f}%")
+        print(format_row('AVERAGE', total_logs, total_original / 1024 / 1024,
+                         total_compressed / 1024, avg_ratio, avg_vs_gzip))
         print()
     
     # Save results to files
     if results:
-        import json
-        
         # Create results directory
         results_dir = Path("evaluation/results")
         results_dir.mkdir(exist_ok=True, parents=True)
@@ -253,7 +353,7 @@ def main():
         json_data = {
             'timestamp': datetime.now().isoformat(),
             'total_datasets': len(results),
-            'total_logs': sum(r['logs'] for r in results),
+            'total_logs': total_logs,
             'total_original_bytes': total_original,
             'total_compressed_bytes': total_compressed,
             'total_gzip_bytes': total_gzip,
@@ -263,8 +363,7 @@ def main():
             'datasets': results
         }
         
-        with open(json_file, 'w') as f:
-            json.dump(json_data, f, indent=2)
+        write_json(json_file, json_data, pretty=True)
         
         print(f"✓ JSON results saved to: {json_file}")
         
@@ -274,11 +373,13 @@ def main():
             f.write("# logpress Evaluation Results\n\n")
             f.write(f"**Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             f.write(f"**Total Datasets**: {len(results)}\n")
-            f.write(f"**Total Logs**: {sum(r['logs'] for r in results):,}\n")
+            f.write(f"**Total Logs**: {total_logs:,}\n")
             f.write(f"**Total Original Size**: {total_original/1024/1024:.2f} MB\n")
             f.write(f"**Total Compressed Size**: {total_compressed/1024:.2f} KB\n")
             f.write(f"**Average Compression Ratio**: {avg_ratio:.2f}×\n")
-            f.write(f"**vs gzip-9**: {avg_vs_gzip:.1f}%\n\n")
+            f.write(f"**vs gzip-{gzip_level}**: {avg_vs_gzip:.1f}%\n")
+            f.write(f"**gzip Engine**: {gzip_engines} (gzip sizes differ slightly between engines; "
+                    f"zlib is the stdlib reference)\n\n")
             
             f.write("## Summary Table\n\n")
             f.write("| Dataset | Logs | Original Size | Compressed Size | Ratio | vs gzip | Compression Speed | Decompression Speed | Templates |\n")
@@ -298,7 +399,7 @@ def main():
                        f"{decomp_speed:.2f} MB/s | "
                        f"{r['templates']} |\n")
             
-            f.write(f"\n**Average** | {sum(r['logs'] for r in results):,} | "
+            f.write(f"\n**Average** | {total_logs:,} | "
                    f"{total_original/1024/1024:.2f} MB | "
                    f"{total_compressed/1024:.2f} KB | "
                    f"{avg_ratio:.2f}× | "
@@ -311,9 +412,9 @@ def main():
                 f.write(f"- **Original Size**: {r['original_bytes']:,} bytes ({r['original_bytes']/1024/1024:.2f} MB)\n")
                 f.write(f"- **Compressed Size**: {r['compressed_bytes']:,} bytes ({r['compressed_bytes']/1024:.2f} KB)\n")
                 f.write(f"- **Compression Ratio**: {r['compression_ratio']:.2f}×\n")
-                f.write(f"- **gzip-9 Size**: {r['gzip_bytes']:,} bytes ({r['gzip_bytes']/1024:.2f} KB)\n")
-                f.write(f"- **gzip-9 Ratio**: {r['gzip_ratio']:.2f}×\n")
-                f.write(f"- **vs gzip-9**: {(r['compression_ratio']/r['gzip_ratio'])*100:.1f}%\n")
+                f.write(f"- **gzip-{gzip_level} Size**: {r['gzip_bytes']:,} bytes ({r['gzip_bytes']/1024:.2f} KB)\n")
+                f.write(f"- **gzip-{gzip_level} Ratio**: {r['gzip_ratio']:.2f}×\n")
+                f.write(f"- **vs gzip-{gzip_level}**: {(r['compression_ratio']/r['gzip_ratio'])*100:.1f}%\n")
                 f.write(f"- **Compression Time**: {r['compress_time']:.3f}s ({r['original_bytes']/r['compress_time']/1024/1024:.2f} MB/s)\n")
                 f.write(f"- **Decompression Time**: {r['decompress_time']:.3f}s ({r['original_bytes']/r['decompress_time']/1024/1024:.2f} MB/s)\n")
                 f.write(f"- **Templates Extracted**: {r['templates']}\n\n")
@@ -325,18 +426,20 @@ def main():
         latest_json = results_dir / "evaluation_results_latest.json"
         latest_md = results_dir / "evaluation_results_latest.md"
         
-        with open(latest_json, 'w') as f:
-            json.dump(json_data, f, indent=2)
+        # Same content as json_file, so copy it instead of serializing again
+        shutil.copyfile(json_file, latest_json)
         
         with open(latest_md, 'w') as f:
             f.write("# logpress Evaluation Results (Latest)\n\n")
             f.write(f"**Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             f.write(f"**Total Datasets**: {len(results)}\n")
-            f.write(f"**Total Logs**: {sum(r['logs'] for r in results):,}\n")
+            f.write(f"**Total Logs**: {total_logs:,}\n")
             f.write(f"**Total Original Size**: {total_original/1024/1024:.2f} MB\n")
             f.write(f"**Total Compressed Size**: {total_compressed/1024:.2f} KB\n")
             f.write(f"**Average Compression Ratio**: {avg_ratio:.2f}×\n")
-            f.write(f"**vs gzip-9**: {avg_vs_gzip:.1f}%\n\n")
+            f.write(f"**vs gzip-{gzip_level}**: {avg_vs_gzip:.1f}%\n")
+            f.write(f"**gzip Engine**: {gzip_engines} (gzip sizes differ slightly between engines; "
+                    f"zlib is the stdlib reference)\n\n")
             
             f.write("## Summary Table\n\n")
             f.write("| Dataset | Logs | Original Size | Compressed Size | Ratio | vs gzip | Compression Speed | Decompression Speed | Templates |\n")
@@ -356,7 +459,7 @@ def main():
                        f"{decomp_speed:.2f} MB/s | "
                        f"{r['templates']} |\n")
             
-            f.write(f"\n**Average** | {sum(r['logs'] for r in results):,} | "
+            f.write(f"\n**Average** | {total_logs:,} | "
                    f"{total_original/1024/1024:.2f} MB | "
                    f"{total_compressed/1024:.2f} KB | "
                    f"{avg_ratio:.2f}× | "
@@ -369,9 +472,9 @@ def main():
                 f.write(f"- **Original Size**: {r['original_bytes']:,} bytes ({r['original_bytes']/1024/1024:.2f} MB)\n")
                 f.write(f"- **Compressed Size**: {r['compressed_bytes']:,} bytes ({r['compressed_bytes']/1024:.2f} KB)\n")
                 f.write(f"- **Compression Ratio**: {r['compression_ratio']:.2f}×\n")
-                f.write(f"- **gzip-9 Size**: {r['gzip_bytes']:,} bytes ({r['gzip_bytes']/1024:.2f} KB)\n")
-                f.write(f"- **gzip-9 Ratio**: {r['gzip_ratio']:.2f}×\n")
-                f.write(f"- **vs gzip-9**: {(r['compression_ratio']/r['gzip_ratio'])*100:.1f}%\n")
+                f.write(f"- **gzip-{gzip_level} Size**: {r['gzip_bytes']:,} bytes ({r['gzip_bytes']/1024:.2f} KB)\n")
+                f.write(f"- **gzip-{gzip_level} Ratio**: {r['gzip_ratio']:.2f}×\n")
+                f.write(f"- **vs gzip-{gzip_level}**: {(r['compression_ratio']/r['gzip_ratio'])*100:.1f}%\n")
                 f.write(f"- **Compression Time**: {r['compress_time']:.3f}s ({r['original_bytes']/r['compress_time']/1024/1024:.2f} MB/s)\n")
                 f.write(f"- **Decompression Time**: {r['decompress_time']:.3f}s ({r['original_bytes']/r['decompress_time']/1024/1024:.2f} MB/s)\n")
                 f.write(f"- **Templates Extracted**: {r['templates']}\n\n")
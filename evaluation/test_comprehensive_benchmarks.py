@@ -119,12 +119,8 @@ def test_logpress_compression(log_file):
     try:
         # Load logs
         print("Loading logs...", end=' ', flush=True)
-        logs = []
         with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    logs.append(line)
+            logs = [line for line in map(str.strip, f) if line]
         print(f"✓ {len(logs)} logs loaded")
         
         # Compress
@@ -140,9 +136,7 @@ def test_logpress_compression(log_file):
         compressed_file = Path('evaluation/compressed/test_Proxifier.lsc')
         compressed_file.parent.mkdir(exist_ok=True, parents=True)
         compressor.cd = compressed_data  # Set the compressed data
-        compressor.save(compressed_file, verbose=False)
-        
-        compressed_size = compressed_file.stat().st_size
+        compressed_size = compressor.save(compressed_file, verbose=False)
         ratio = original_size / compressed_size
         speed_mbps = (original_size / 1024 / 1024) / compress_time
         logs_per_second = len(logs) / compress_time
@@ -158,7 +152,8 @@ def test_logpress_compression(log_file):
             'logs': len(logs),
             'logs_per_second': logs_per_second,
             'templates': stats.template_count,
-            'compressed_file': compressed_file
+            'compressed_file': compressed_file,
+            'compressed_data': compressed_data
         }
         
     except Exception as e:
@@ -168,18 +163,21 @@ def test_logpress_compression(log_file):
         return False, None
 
 
-def test_query_performance(compressed_file, original_file):
-    """Test query performance"""
+def test_query_performance(compressed_file, original_file, compressed_data=None):
+    """Test query performance (reuses compressed_data from TEST 3 when given)"""
     print("\nTEST 4: Query Performance")
     print("-" * 60)
     
     try:
-        # Load compressed data
-        print("Loading compressed data...", end=' ', flush=True)
         engine = QueryEngine()
-        engine.load(compressed_file)
-        compressed_data = engine.compressed
-        print("✓")
+        if compressed_data is None:
+            # Load compressed data
+            print("Loading compressed data...", end=' ', flush=True)
+            engine.load(compressed_file)
+            compressed_data = engine.compressed
+            print("✓")
+        else:
+            engine.compressed = compressed_data
         
         # Test 1: Count all logs (metadata only)
         print("Query 1: Count all logs...", end=' ', flush=True)
@@ -312,7 +310,8 @@ def main():
             print("\n⚠ Query tests skipped due to compression failure")
         else:
             # Test 4: Query performance
-            if not test_query_performance(logpress_result['compressed_file'], log_file):
+            if not test_query_performance(logpress_result['compressed_file'], log_file,
+                                          logpress_result['compressed_data']):
                 all_passed = False
             
             # Cleanup test compressed file
@@ -27,18 +27,44 @@ __version__ = "1.0.7"
 __author__ = "Adam Bouafia"
 __license__ = "MIT"
 
-# High-level API (recommended for most users)
-from logpress.api import LogPress, compress, query
+import importlib
 
 # Core MCP layers (advanced usage)
 from logpress import models, protocols
-from logpress.context import LogTokenizer, Tokenizer, TemplateGenerator, SemanticTypeRecognizer, SemanticFieldClassifier
-from logpress.services import SemanticCompressor, Compressor, QueryEngine, SchemaEvaluator, Evaluator, SchemaVersioner
 
-# Legacy compatibility aliases
-LogTokenizer = LogTokenizer
-SemanticTypeRecognizer = SemanticTypeRecognizer
-SchemaEvaluator = SchemaEvaluator
+# Everything else is imported on first access (PEP 562), so `logpress --help`
+# and `logpress.__version__` don't pay for zstandard, msgpack and the regex tables
+_LAZY_ATTRIBUTES = {
+    # High-level API (recommended for most users)
+    'LogPress': 'logpress.api',
+    'compress': 'logpress.api',
+    'query': 'logpress.api',
+    'LogTokenizer': 'logpress.context',
+    'Tokenizer': 'logpress.context',
+    'TemplateGenerator': 'logpress.context',
+    'SemanticTypeRecognizer': 'logpress.context',
+    'SemanticFieldClassifier': 'logpress.context',
+    'SemanticCompressor': 'logpress.services',
+    'Compressor': 'logpress.services',
+    'QueryEngine': 'logpress.services',
+    'SchemaEvaluator': 'logpress.services',
+    'Evaluator': 'logpress.services',
+    'SchemaVersioner': 'logpress.services',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module 'logpress' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # cache, so __getattr__ runs once per name
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     # High-level API (⭐ Start here!)
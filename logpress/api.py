@@ -7,7 +7,6 @@ For advanced control, use the lower-level components directly.
 
 from typing import List, Dict, Optional, Union, Tuple
 from pathlib import Path
-import tempfile
 
 from logpress.services import Compressor, QueryEngine
 from logpress.models import CompressedLog
@@ -78,17 +77,15 @@ class LogPress:
         if not input_path.exists():
             raise FileNotFoundError(f"Input file not found: {input_path}")
         
-        # Read logs
-        with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-            logs = [line.strip() for line in f if line.strip()]
+        # Read logs (1 MB buffer, each line stripped once)
+        with open(input_path, 'r', encoding='utf-8', errors='ignore', buffering=1 << 20) as f:
+            logs = [line for line in map(str.strip, f) if line]
         
         # Compress
         compressed, stats = self.compressor.compress(logs)
         
         # Save (compressor retains compressed_data internally)
-        self.compressor.save(Path(output_path))
-        
-        output_size = Path(output_path).stat().st_size
+        output_size = self.compressor.save(Path(output_path))
         
         return {
             'compression_ratio': stats.compression_ratio,
@@ -142,16 +139,10 @@ class LogPress:
             >>> data = lp.compress_to_bytes(logs)
             >>> # Send over network or save to database
         """
-        compressed, _ = self.compressor.compress(logs)
-        
-        # Save to temporary file and read bytes
-        with tempfile.NamedTemporaryFile(suffix='.lsc', delete=False) as tmp:
-            self.compressor.save(compressed, tmp.name)
-            with open(tmp.name, 'rb') as f:
-                data = f.read()
-            Path(tmp.name).unlink()
+        self.compressor.compress(logs)
         
-        return data
+        # Same bytes save() would write, without a temporary file
+        return self.compressor.to_bytes()
     
     def query(
         self,
@@ -5,7 +5,6 @@ CLI commands for logpress.
 import click
 import sys
 from pathlib import Path
-from logpress.services import SemanticCompressor
 
 @click.command()
 @click.option('--input', '-i', required=True, help='Input log file path')
@@ -20,6 +19,7 @@ def compress(input, output, measure, min_support):
         logpress compress -i datasets/Apache/Apache_full.log -o compressed/apache.lsc -m
     """
     import time
+    from logpress.services import SemanticCompressor
     input_path = Path(input)
     output_path = Path(output)
     
@@ -34,9 +34,9 @@ def compress(input, output, measure, min_support):
     
     compressor = SemanticCompressor(min_support=min_support)
     
-    # Read logs
-    with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-        logs = [line.strip() for line in f if line.strip()]
+    # Read logs (1 MB buffer, each line stripped once)
+    with open(input_path, 'r', encoding='utf-8', errors='ignore', buffering=1 << 20) as f:
+        logs = [line for line in map(str.strip, f) if line]
     
     click.echo(f"Processing {len(logs)} log entries...")
     
@@ -46,11 +46,10 @@ def compress(input, output, measure, min_support):
     elapsed = time.time() - start
     
     # Save to file
-    compressor.save(output_path, verbose=False)
+    compressed_size = compressor.save(output_path, verbose=False)
     
     if measure:
         original_size = input_path.stat().st_size
-        compressed_size = output_path.stat().st_size
         ratio = original_size / compressed_size if compressed_size > 0 else 0
         
         click.echo("\n=== Compression Results ===")
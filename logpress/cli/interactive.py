@@ -12,11 +12,13 @@ from rich.tree import Tree
 from rich.layout import Layout
 from rich import box
 from pathlib import Path
+import os
 import time
 import shutil
 import subprocess
 import sys
-from typing import List, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
 # Import logpress components
@@ -25,6 +27,36 @@ from logpress.services.compressor import SemanticCompressor
 console = Console()
 
 
+def count_lines(path: Path, chunk_size: int = 1 << 20) -> int:
+    """Count lines by scanning raw bytes for newlines (no UTF-8 decoding)"""
+    lines = 0
+    last_chunk = b''
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            lines += chunk.count(b'\n')
+            last_chunk = chunk
+    # A final line without a trailing newline still counts
+    if last_chunk and not last_chunk.endswith(b'\n'):
+        lines += 1
+    return lines
+
+
+def compress_dataset_file(log_path: Path, output: Path, min_support: int) -> Tuple[int, int]:
+    """
+    Compress one dataset file to `output` (runs in a worker process)
+    
+    Returns:
+        (template count, compressed size in bytes)
+    """
+    with open(log_path, 'r', errors='ignore', buffering=1 << 20) as f:
+        logs = [line for line in map(str.strip, f) if line]
+    
+    compressor = SemanticCompressor(min_support=min_support)
+    _, stats = compressor.compress(logs, verbose=False)
+    compressed_size = compressor.save(output, verbose=False)
+    return stats.template_count, compressed_size
+
+
 @dataclass
 class Dataset:
     """Dataset information"""
@@ -76,7 +108,7 @@ class InteractiveCLI:
                     
                     if log_file and log_file.exists():
                         try:
-                            lines = sum(1 for _ in open(log_file, 'r', errors='ignore'))
+                            lines = count_lines(log_file)
                             size_mb = log_file.stat().st_size / (1024 * 1024)
                             
                             datasets.append(Dataset(
@@ -268,51 +300,49 @@ class InteractiveCLI:
             )
             
             results = []
+            tasks = {
+                ds.name: progress.add_task(f"[yellow]Queued {ds.name}", total=100)
+                for ds in selected
+            }
             
-            for ds in selected:
-                # Add task for this dataset
-                task = progress.add_task(
-                    f"[green]Compressing {ds.name}",
-                    total=100
-                )
-                
-                try:
-                    # Read logs
-                    progress.update(task, description=f"[yellow]Reading {ds.name}")
-                    with open(ds.path, 'r', errors='ignore') as f:
-                        logs = [line.strip() for line in f if line.strip()]
-                    progress.update(task, advance=20)
-                    
-                    # Compress
-                    progress.update(task, description=f"[cyan]Compressing {ds.name}")
-                    compressor = SemanticCompressor(min_support=min_support)
-                    compressed_log, stats = compressor.compress(logs, verbose=False)
-                    progress.update(task, advance=60)
-                    
-                    # Save
-                    progress.update(task, description=f"[blue]Saving {ds.name}")
+            # Datasets are independent, so compress them in parallel worker processes
+            workers = max(1, min(len(selected), os.cpu_count() or 1))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {}
+                for ds in selected:
                     output = self.compressed_dir / f"{ds.name.lower()}_full.lsc"
-                    compressor.save(output, verbose=False)
-                    progress.update(task, advance=20)
-                    
-                    # Calculate metrics
-                    if measure:
-                        compressed_size = output.stat().st_size
-                        ratio = (ds.size_mb * 1024 * 1024) / compressed_size
-                        results.append({
-                            'name': ds.name,
-                            'ratio': ratio,
-                            'templates': stats.template_count,
-                            'original_mb': ds.size_mb,
-                            'compressed_kb': compressed_size / 1024
-                        })
+                    future = executor.submit(compress_dataset_file, ds.path, output, min_support)
+                    futures[future] = ds
+                    progress.update(tasks[ds.name], description=f"[cyan]Compressing {ds.name}")
+                
+                finished = {}
+                for future in as_completed(futures):
+                    ds = futures[future]
+                    task = tasks[ds.name]
+                    try:
+                        template_count, compressed_size = future.result()
+                    except Exception as e:
+                        progress.update(task, description=f"[red]✗ {ds.name} failed: {e}")
+                        console.print(f"[red]Error compressing {ds.name}: {e}[/red]")
+                        continue
                     
+                    finished[ds.name] = (template_count, compressed_size)
+                    progress.update(task, completed=100, description=f"[green]✓ {ds.name} complete")
                     progress.update(overall_task, advance=1)
-                    progress.update(task, description=f"[green]✓ {ds.name} complete")
-                    
-                except Exception as e:
-                    progress.update(task, description=f"[red]✗ {ds.name} failed: {e}")
-                    console.print(f"[red]Error compressing {ds.name}: {e}[/red]")
+            
+            # Calculate metrics (in selection order, not completion order)
+            if measure:
+                for ds in selected:
+                    if ds.name not in finished:
+                        continue
+                    template_count, compressed_size = finished[ds.name]
+                    results.append({
+                        'name': ds.name,
+                        'ratio': (ds.size_mb * 1024 * 1024) / compressed_size,
+                        'templates': template_count,
+                        'original_mb': ds.size_mb,
+                        'compressed_kb': compressed_size / 1024
+                    })
         
         console.print()
         
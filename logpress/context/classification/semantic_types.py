@@ -18,6 +18,9 @@ from dataclasses import dataclass
 from enum import Enum
 from dateutil import parser as date_parser
 
+# Upper bound on memoized best matches per recognizer
+BEST_MATCH_CACHE_SIZE = 65536
+
 
 class SemanticType(Enum):
     """Semantic field types found in logs"""
@@ -66,6 +69,10 @@ class SemanticTypeRecognizer:
     
     def __init__(self):
         self._compile_patterns()
+        # Log fields repeat heavily (severities, hosts, constants shared by templates),
+        # so best matches are memoized per recognizer. A plain dict (unlike a bound
+        # lru_cache) keeps the recognizer picklable for process pools.
+        self._best_match_cache: Dict[str, SemanticMatch] = {}
     
     def _compile_patterns(self):
         """Compile all regex patterns for efficiency"""
@@ -204,6 +211,24 @@ class SemanticTypeRecognizer:
             (re.compile(r'\b(start(?:ed|ing)?|stop(?:ped|ping)?|restart(?:ed|ing)?|open(?:ed|ing)?|clos(?:ed?|ing)|connect(?:ed|ing)?|disconnect(?:ed|ing)?)\b', re.IGNORECASE),
              0.80, "action_verb"),
         ]
+        
+        # Categories in priority order (ties between equal confidences go to the earlier one)
+        self.pattern_groups = [
+            (self.timestamp_patterns, SemanticType.TIMESTAMP),
+            (self.ip_patterns, SemanticType.IP_ADDRESS),
+            (self.port_patterns, SemanticType.PORT),
+            (self.severity_patterns, SemanticType.SEVERITY),
+            (self.status_patterns, SemanticType.STATUS),
+            (self.error_code_patterns, SemanticType.ERROR_CODE),
+            (self.user_id_patterns, SemanticType.USER_ID),
+            (self.process_id_patterns, SemanticType.PROCESS_ID),
+            (self.metric_patterns, SemanticType.METRIC_VALUE),
+            (self.module_patterns, SemanticType.MODULE),
+            (self.request_id_patterns, SemanticType.REQUEST_ID),
+            (self.filename_patterns, SemanticType.FILENAME),
+            (self.host_patterns, SemanticType.HOST),
+            (self.action_patterns, SemanticType.ACTION),
+        ]
     
     def recognize(self, field_value: str, context: Optional[Dict] = None) -> List[SemanticMatch]:
         """
@@ -222,20 +247,8 @@ class SemanticTypeRecognizer:
         matches = []
         
         # Try each pattern category
-        matches.extend(self._match_patterns(field_value, self.timestamp_patterns, SemanticType.TIMESTAMP))
-        matches.extend(self._match_patterns(field_value, self.ip_patterns, SemanticType.IP_ADDRESS))
-        matches.extend(self._match_patterns(field_value, self.port_patterns, SemanticType.PORT))
-        matches.extend(self._match_patterns(field_value, self.severity_patterns, SemanticType.SEVERITY))
-        matches.extend(self._match_patterns(field_value, self.status_patterns, SemanticType.STATUS))
-        matches.extend(self._match_patterns(field_value, self.error_code_patterns, SemanticType.ERROR_CODE))
-        matches.extend(self._match_patterns(field_value, self.user_id_patterns, SemanticType.USER_ID))
-        matches.extend(self._match_patterns(field_value, self.process_id_patterns, SemanticType.PROCESS_ID))
-        matches.extend(self._match_patterns(field_value, self.metric_patterns, SemanticType.METRIC_VALUE))
-        matches.extend(self._match_patterns(field_value, self.module_patterns, SemanticType.MODULE))
-        matches.extend(self._match_patterns(field_value, self.request_id_patterns, SemanticType.REQUEST_ID))
-        matches.extend(self._match_patterns(field_value, self.filename_patterns, SemanticType.FILENAME))
-        matches.extend(self._match_patterns(field_value, self.host_patterns, SemanticType.HOST))
-        matches.extend(self._match_patterns(field_value, self.action_patterns, SemanticType.ACTION))
+        for patterns, semantic_type in self.pattern_groups:
+            matches.extend(self._match_patterns(field_value, patterns, semantic_type))
         
         # Sort by confidence (highest first)
         matches.sort(key=lambda m: m.confidence, reverse=True)
@@ -271,14 +284,108 @@ class SemanticTypeRecognizer:
         return matches
     
     def get_best_match(self, field_value: str, context: Optional[Dict] = None) -> SemanticMatch:
-        """Get the single best semantic type match for a field"""
+        """
+        Get the single best semantic type match for a field
+        
+        Equivalent to recognize(...)[0], but stops scanning patterns as soon as
+        a match reaches the highest confidence any pattern has, since nothing
+        later can outrank it. Results are cached by value alone, so treat the
+        returned match as read-only. A subclass that overrides recognize() is
+        used as is (uncached).
+        
+        Args:
+            field_value: The field content to analyze
+            context: Accepted for compatibility; matching is not context-sensitive
+            
+        Returns:
+            Best match, MESSAGE for unrecognized text, UNKNOWN for empty values
+        """
+        if self._recognize_overridden():
+            return self._best_of_recognize(field_value, context)
+        return self._cached_best_match(field_value)
+    
+    def _recognize_overridden(self) -> bool:
+        """Whether a subclass replaced recognize(), which get_best_match() must then honor"""
+        return type(self).recognize is not SemanticTypeRecognizer.recognize
+    
+    def _best_of_recognize(self, field_value: str, context: Optional[Dict] = None) -> SemanticMatch:
+        """Top recognize() result, UNKNOWN when it returns nothing"""
         matches = self.recognize(field_value, context)
-        return matches[0] if matches else SemanticMatch(
+        if matches:
+            return matches[0]
+        return SemanticMatch(
             type=SemanticType.UNKNOWN,
             value=field_value,
             confidence=0.0,
             pattern_name="no_match"
         )
+    
+    def _cached_best_match(self, field_value: str) -> SemanticMatch:
+        """Memoized _find_best_match(); new values stop being cached once the memo is full"""
+        best = self._best_match_cache.get(field_value)
+        if best is None:
+            best = self._find_best_match(field_value)
+            if len(self._best_match_cache) < BEST_MATCH_CACHE_SIZE:
+                self._best_match_cache[field_value] = best
+        return best
+    
+    def _find_best_match(self, field_value: str) -> SemanticMatch:
+        """Uncached implementation of get_best_match()"""
+        if not field_value or not field_value.strip():
+            return SemanticMatch(
+                type=SemanticType.UNKNOWN,
+                value=field_value,
+                confidence=0.0,
+                pattern_name="no_match"
+            )
+        
+        # Highest confidence any pattern can return; a match at this level can't be
+        # beaten. Taken from the current pattern lists, so patterns added after
+        # construction are honored.
+        max_confidence = max(
+            (confidence for patterns, _ in self.pattern_groups for _, confidence, _ in patterns),
+            default=0.0
+        )
+        
+        best = None
+        for patterns, semantic_type in self.pattern_groups:
+            for pattern, confidence, pattern_name in patterns:
+                if best is not None and confidence <= best.confidence:
+                    continue
+                match = pattern.search(field_value)
+                if match:
+                    best = SemanticMatch(
+                        type=semantic_type,
+                        value=match.group(1) if match.groups() else match.group(0),
+                        confidence=confidence,
+                        pattern_name=pattern_name,
+                        start_pos=match.start(),
+                        end_pos=match.end()
+                    )
+                    if confidence >= max_confidence:
+                        return best
+        
+        if best is None:
+            best = SemanticMatch(
+                type=SemanticType.MESSAGE,
+                value=field_value,
+                confidence=0.50,
+                pattern_name="default_message"
+            )
+        return best
+    
+    def get_best_matches(self, field_values: List[str]) -> List[SemanticMatch]:
+        """
+        Batch version of get_best_match()
+        
+        Repeated values (common in sampled columns) are classified once.
+        
+        Returns:
+            Best match for each value, in input order
+        """
+        if self._recognize_overridden():
+            return [self._best_of_recognize(value) for value in field_values]
+        return [self._cached_best_match(value) for value in field_values]
 
 
 # Example usage
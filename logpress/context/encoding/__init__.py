@@ -3,13 +3,14 @@ Encoding context for data compression.
 """
 
 from logpress.context.encoding.varint import encode_varint, decode_varint
-from logpress.context.encoding.bwt import bwt_transform, bwt_inverse
+from logpress.context.encoding.bwt import bwt_transform, bwt_transform_many, bwt_inverse
 from logpress.context.encoding.gorilla import GorillaTimestampCompressor
 
 __all__ = [
     'encode_varint',
     'decode_varint',
     'bwt_transform',
+    'bwt_transform_many',
     'bwt_inverse',
     'GorillaTimestampCompressor',
 ]
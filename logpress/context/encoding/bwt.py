@@ -15,21 +15,30 @@ Benefits:
 - Reversible transformation (no information loss)
 - Works best with 1-10MB blocks
 
-Implementation uses suffix array construction for O(n log n) performance
-instead of naive O(n²) rotation approach.
+Rotations are sorted by prefix doubling (O(n log² n), linear memory), or
+by libdivsufsort's suffix array when pydivsufsort is installed.
 """
 
-from typing import Tuple
+from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor
 import struct
 
+# Optional C suffix array construction (SA-IS) for large blocks
+try:
+    from pydivsufsort import divsufsort
+    PYDIVSUFSORT_AVAILABLE = True
+except ImportError:
+    PYDIVSUFSORT_AVAILABLE = False
 
-def bwt_transform(data: bytes, block_size: int = 1024 * 1024) -> bytes:
+
+def bwt_transform(data: bytes, block_size: int = 1024 * 1024, workers: int = 1) -> bytes:
     """
     Apply Burrows-Wheeler Transform to data in blocks
     
     Args:
         data: Input bytes to transform
         block_size: Size of each block (default 1MB)
+        workers: Processes used to transform independent blocks (default 1)
         
     Returns:
         Transformed bytes with block headers
@@ -40,36 +49,60 @@ def bwt_transform(data: bytes, block_size: int = 1024 * 1024) -> bytes:
         [block2_size: 4 bytes][block2_index: 4 bytes][block2_data: N bytes]
         ...
     """
-    if not data:
-        return struct.pack('<I', 0)  # No blocks
+    # Blocks are independent, so they can be transformed in parallel
+    blocks = _split_blocks(data, block_size)
+    return _frame_blocks(_map_blocks(_bwt_encode_block, workers, blocks))
+
+
+def bwt_transform_many(buffers: List[bytes], block_size: int = 1024 * 1024,
+                       workers: int = 1) -> List[bytes]:
+    """
+    Apply bwt_transform to several buffers, sharing one pool of workers
     
-    result = bytearray()
-    num_blocks = (len(data) + block_size - 1) // block_size
-    result.extend(struct.pack('<I', num_blocks))
-    
-    # Process each block
-    for i in range(num_blocks):
-        start = i * block_size
-        end = min(start + block_size, len(data))
-        block = data[start:end]
-        
-        # Transform this block
-        transformed, original_index = _bwt_encode_block(block)
+    The blocks of all buffers are transformed together, so small buffers
+    (one block each) still keep every worker busy and the pool starts once.
+    
+    Args:
+        buffers: Input byte strings (e.g. packed output of several datasets)
+        block_size: Size of each block (default 1MB)
+        workers: Processes used to transform blocks (default 1)
         
+    Returns:
+        Transformed bytes for each buffer, identical to bwt_transform(buffer)
+    """
+    split = [_split_blocks(data, block_size) for data in buffers]
+    encoded = _map_blocks(_bwt_encode_block, workers, [b for blocks in split for b in blocks])
+    
+    results = []
+    offset = 0
+    for blocks in split:
+        results.append(_frame_blocks(encoded[offset:offset + len(blocks)]))
+        offset += len(blocks)
+    return results
+
+
+def _split_blocks(data: bytes, block_size: int) -> List[bytes]:
+    """Cut data into consecutive blocks of at most block_size bytes"""
+    return [data[start:start + block_size] for start in range(0, len(data), block_size)]
+
+
+def _frame_blocks(encoded: List[Tuple[bytes, int]]) -> bytes:
+    """Serialize encoded blocks with the block count and per-block headers"""
+    result = bytearray(struct.pack('<I', len(encoded)))
+    for transformed, original_index in encoded:
         # Write block: size + original_index + data
-        result.extend(struct.pack('<I', len(transformed)))
-        result.extend(struct.pack('<I', original_index))
+        result.extend(struct.pack('<II', len(transformed), original_index))
         result.extend(transformed)
-    
     return bytes(result)
 
 
-def bwt_inverse(data: bytes) -> bytes:
+def bwt_inverse(data: bytes, workers: int = 1) -> bytes:
     """
     Reverse Burrows-Wheeler Transform
     
     Args:
         data: BWT-transformed bytes with headers
+        workers: Processes used to decode independent blocks (default 1)
         
     Returns:
         Original bytes
@@ -82,10 +115,11 @@ def bwt_inverse(data: bytes) -> bytes:
     if num_blocks == 0:
         return b''
     
-    result = bytearray()
+    blocks = []
+    indices = []
     offset = 4
     
-    # Decode each block
+    # Read all blocks, then decode them
     for block_idx in range(num_blocks):
         if offset + 8 > len(data):
             break
@@ -99,22 +133,25 @@ def bwt_inverse(data: bytes) -> bytes:
             break
         
         # Extract block data
-        block = data[offset:offset+block_size]
+        blocks.append(data[offset:offset+block_size])
+        indices.append(original_index)
         offset += block_size
-        
-        # Decode this block
-        decoded = _bwt_decode_block(block, original_index)
-        result.extend(decoded)
     
-    return bytes(result)
+    return b''.join(_map_blocks(_bwt_decode_block, workers, blocks, indices))
+
+
+def _map_blocks(func, workers: int, *iterables) -> list:
+    """Apply func across blocks, in worker processes when there is more than one block"""
+    if workers > 1 and len(iterables[0]) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(iterables[0]))) as executor:
+            return list(executor.map(func, *iterables))
+    return list(map(func, *iterables))
 
 
 def _bwt_encode_block(block: bytes) -> Tuple[bytes, int]:
     """
     Encode a single block using BWT
     
-    Uses suffix array construction for O(n log n) performance.
-    
     Args:
         block: Input block
         
@@ -124,32 +161,71 @@ def _bwt_encode_block(block: bytes) -> Tuple[bytes, int]:
     if len(block) <= 1:
         return block, 0
     
-    n = len(block)
+    rotations = _sort_rotations(block)
     
-    # Create rotation indices sorted lexicographically
-    # rotation[i] represents the string starting at position i and wrapping around
-    rotations = list(range(n))
+    # Build last column from sorted rotations
+    # For rotation starting at position i, the last char is at i-1 (block[-1] for i=0)
+    last_column = bytes(block[start_pos - 1] for start_pos in rotations)
+    
+    # The original string is the rotation that starts at position 0
+    original_index = rotations.index(0)
+    return last_column, original_index
+
+
+def _sort_rotations(block: bytes) -> List[int]:
+    """
+    Sort the cyclic rotations of a block lexicographically
     
-    # Sort by the rotation starting at each position
-    def rotation_key(i):
-        # Compare rotation starting at position i
-        return block[i:] + block[:i]
+    Args:
+        block: Input block (at least 2 bytes)
+        
+    Returns:
+        Start positions of the rotations in sorted order
+    """
+    n = len(block)
     
-    rotations.sort(key=rotation_key)
+    if PYDIVSUFSORT_AVAILABLE:
+        # Suffixes of block+block starting before n sort like the rotations
+        doubled = block + block
+        order = [i for i in divsufsort(doubled).tolist() if i < n]
+        
+        # A periodic block has equal rotations, which the suffix array lists by
+        # descending position (shorter suffix first). Put each run in position
+        # order like prefix doubling, so original_index doesn't depend on the backend.
+        period = doubled.find(block, 1)
+        if period < n:
+            run = n // period
+            order = [i for start in range(0, n, run) for i in sorted(order[start:start + run])]
+        return order
+    
+    # Prefix doubling: rank[i] orders rotation i by its first k bytes.
+    # Sorts are stable, so equal rotations keep position order.
+    rank = list(block)
+    order = sorted(range(n), key=rank.__getitem__)
+    k = 1
+    while k < n:
+        # Key for the first 2k bytes = (rank of first k, rank of next k)
+        base = max(rank) + 1
+        shifted = rank[k:] + rank[:k]
+        keys = [a * base + b for a, b in zip(rank, shifted)]
+        order.sort(key=keys.__getitem__)
+        
+        # Re-rank: equal keys share a rank
+        new_rank = [0] * n
+        r = 0
+        prev = keys[order[0]]
+        for i in order:
+            if keys[i] != prev:
+                r += 1
+                prev = keys[i]
+            new_rank[i] = r
+        rank = new_rank
+        
+        if r == n - 1:
+            break  # All rotations distinguished
+        k *= 2
     
-    # Build last column from sorted rotations
-    # For rotation starting at position i, the last char is at (i-1) % n
-    last_column = bytearray()
-    original_index = -1
-    
-    for row_idx, start_pos in enumerate(rotations):
-        last_column.append(block[(start_pos - 1) % n])
-        # The original string is the rotation that starts at position 0
-        if start_pos == 0:
-            original_index = row_idx
-    
-    assert original_index >= 0, "Failed to find original index"
-    return bytes(last_column), original_index
+    return order
 
 
 def _bwt_decode_block(block: bytes, original_index: int) -> Tuple[bytes, int]:
@@ -77,6 +77,14 @@ class TemplateGenerator:
         self.min_support = min_support
         self.similarity_threshold = similarity_threshold
         self.templates: List[LogTemplate] = []
+        # Fields of each line from the last extract_schemas() call (None for
+        # blank lines), so callers can match without tokenizing again
+        self.log_fields: List[Optional[List[str]]] = []
+        # Per-template (field count, variable positions) cache for matching
+        self._match_index: List[Tuple[LogTemplate, int, List[Tuple[int, str]]]] = []
+        self._match_index_source: Optional[List[LogTemplate]] = None
+        # Field count -> first accepted (template, variable positions), or None
+        self._match_by_count: Dict[int, Optional[Tuple[LogTemplate, List[Tuple[int, str]]]]] = {}
     
     def extract_schemas(self, log_lines: List[str]) -> List[LogTemplate]:
         """
@@ -94,10 +102,12 @@ class TemplateGenerator:
         # Step 1: Tokenize all logs
         print(f"Tokenizing {len(log_lines)} logs...")
         tokenized_logs = []
+        self.log_fields = [None] * len(log_lines)
         for i, log in enumerate(log_lines):
             if log.strip():
                 tokens = self.tokenizer.tokenize(log)
                 fields = self.tokenizer.get_fields(tokens)
+                self.log_fields[i] = fields
                 tokenized_logs.append({
                     'raw': log,
                     'tokens': tokens,
@@ -187,10 +197,10 @@ class TemplateGenerator:
                 # Constant field - use literal value
                 constant_val = values_at_pos[0]
                 # Still try to identify semantic type for metadata
-                matches = self.recognizer.recognize(constant_val)
-                if matches and matches[0].confidence > 0.80:
+                best = self.recognizer.get_best_match(constant_val)
+                if best.confidence > 0.80:
                     # High confidence semantic type even if constant
-                    semantic_type = matches[0].type
+                    semantic_type = best.type
                     template_pattern.append(f"[{semantic_type.value.upper()}]")
                     field_types[pos] = semantic_type
                 else:
@@ -201,10 +211,10 @@ class TemplateGenerator:
                 # Low cardinality - might be categorical field (like severity level)
                 # Try semantic recognition
                 sample_value = values_at_pos[0]
-                matches = self.recognizer.recognize(sample_value)
+                best = self.recognizer.get_best_match(sample_value)
                 
-                if matches and matches[0].confidence > 0.75:
-                    semantic_type = matches[0].type
+                if best.confidence > 0.75:
+                    semantic_type = best.type
                     template_pattern.append(f"[{semantic_type.value.upper()}]")
                     field_types[pos] = semantic_type
                 else:
@@ -217,10 +227,9 @@ class TemplateGenerator:
                 sample_values = values_at_pos[:min(10, len(values_at_pos))]
                 type_votes = defaultdict(int)
                 
-                for val in sample_values:
-                    matches = self.recognizer.recognize(val)
-                    if matches:
-                        type_votes[matches[0].type] += matches[0].confidence
+                for best in self.recognizer.get_best_matches(sample_values):
+                    if best.type is not SemanticType.UNKNOWN:
+                        type_votes[best.type] += best.confidence
                 
                 if type_votes:
                     # Pick type with highest total confidence
@@ -255,25 +264,72 @@ class TemplateGenerator:
             Tuple of (matched_template, extracted_fields) or None if no match
         """
         tokens = self.tokenizer.tokenize(log_line)
-        fields = self.tokenizer.get_fields(tokens)
+        return self.match_fields_to_template(self.tokenizer.get_fields(tokens))
+    
+    def match_fields_to_template(self, fields: List[str]) -> Optional[Tuple[LogTemplate, Dict]]:
+        """
+        Match already tokenized log fields to an existing template
         
-        # Try to match against existing templates
-        for template in self.templates:
-            # Check if field count matches (approximately)
-            template_field_count = len(template.pattern)
-            if abs(len(fields) - template_field_count) <= 2:  # Allow small variance
-                # Try to extract fields according to template
-                extracted = {}
-                for pos, pattern_part in enumerate(template.pattern):
-                    if pos < len(fields):
-                        if pattern_part.startswith('[') and pattern_part.endswith(']'):
-                            # Variable field
-                            field_type = pattern_part[1:-1]
-                            extracted[field_type] = fields[pos]
-                
-                return (template, extracted)
+        Returns:
+            Tuple of (matched_template, extracted_fields) or None if no match
+        """
+        field_count = len(fields)
+        
+        match = self._template_for_field_count(field_count)
+        if match is None:
+            return None
+        
+        # Extract fields according to template
+        template, variable_positions = match
+        extracted = {}
+        for pos, field_type in variable_positions:
+            if pos < field_count:
+                extracted[field_type] = fields[pos]
         
-        return None
+        return (template, extracted)
+    
+    def _template_for_field_count(self, field_count: int) -> Optional[Tuple[LogTemplate, List[Tuple[int, str]]]]:
+        """
+        Find the first template whose field count is within ±2 of `field_count`
+        
+        The choice only depends on the field count, so it is memoized per
+        count and the template list is scanned once per distinct count.
+        """
+        match_index = self._get_match_index()
+        if field_count not in self._match_by_count:
+            self._match_by_count[field_count] = next(
+                (
+                    (template, variable_positions)
+                    for template, template_field_count, variable_positions in match_index
+                    if abs(field_count - template_field_count) <= 2  # Allow small variance
+                ),
+                None
+            )
+        return self._match_by_count[field_count]
+    
+    def _get_match_index(self) -> List[Tuple[LogTemplate, int, List[Tuple[int, str]]]]:
+        """
+        Get per-template matching data, rebuilding it when templates change
+        
+        Field counts and variable positions only depend on the template, so
+        they are computed once instead of for every matched log line.
+        """
+        if self._match_index_source is not self.templates or len(self._match_index) != len(self.templates):
+            self._match_index = [
+                (
+                    template,
+                    len(template.pattern),
+                    [
+                        (pos, part[1:-1])
+                        for pos, part in enumerate(template.pattern)
+                        if part.startswith('[') and part.endswith(']')
+                    ]
+                )
+                for template in self.templates
+            ]
+            self._match_index_source = self.templates
+            self._match_by_count = {}
+        return self._match_index
     
     def get_schema_summary(self) -> Dict:
         """Get summary statistics of extracted schemas"""
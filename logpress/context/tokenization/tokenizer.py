@@ -64,6 +64,22 @@ class LogTokenizer:
     # Pattern for pipe-delimited format (check if line has multiple pipes)
     PIPE_DELIMITED_PATTERN = re.compile(r'^([^|]+\|){2,}')
     
+    # Pattern for plain-text runs, classified by group name. A run is a NUMBER
+    # only if it is entirely NUMBER_PATTERN and PUNCTUATION only if it is a
+    # substring of ',:;-'; anything else is a WORD.
+    PLAIN_TEXT_PATTERN = re.compile(
+        r'(?P<whitespace>\s+)'
+        r'|(?P<number>\d+(?:\.\d+)?(?!\S))'
+        r'|(?P<punctuation>(?:,(?::(?:;-?)?)?|:(?:;-?)?|;-?|-)(?!\S))'
+        r'|(?P<word>\S+)'
+    )
+    _PLAIN_TOKEN_TYPES = {
+        'whitespace': TokenType.WHITESPACE,
+        'number': TokenType.NUMBER,
+        'punctuation': TokenType.PUNCTUATION,
+        'word': TokenType.WORD,
+    }
+    
     def tokenize(self, log_line: str) -> List[Token]:
         """
         Tokenize a log entry into structured tokens
@@ -129,20 +145,18 @@ class LogTokenizer:
         # Extract brackets and quoted strings first
         special_tokens = []
         
-        # Find all bracketed content
+        # Find all bracketed content (spans come straight from the match objects)
         for match in self.BRACKET_PATTERN.finditer(log_line):
-            special_tokens.append((match.start(), match.end(), 'bracket', match.group(0)))
+            special_tokens.append((*match.span(), 'bracket', match.group(0)))
         
-        # Find all quoted strings
-        for match in self.QUOTED_PATTERN.finditer(log_line):
-            # Check if not inside a bracket
-            inside_bracket = any(
-                start <= match.start() < end 
-                for start, end, ttype, _ in special_tokens 
-                if ttype == 'bracket'
-            )
-            if not inside_bracket:
-                special_tokens.append((match.start(), match.end(), 'quoted', match.group(0)))
+        # Find all quoted strings (most lines have no quotes, so skip the scan)
+        if '"' in log_line or "'" in log_line:
+            bracket_spans = [(start, end) for start, end, _, _ in special_tokens]
+            for match in self.QUOTED_PATTERN.finditer(log_line):
+                # Check if not inside a bracket
+                quote_start = match.start()
+                if not any(start <= quote_start < end for start, end in bracket_spans):
+                    special_tokens.append((quote_start, match.end(), 'quoted', match.group(0)))
         
         # Sort by position
         special_tokens.sort()
@@ -181,48 +195,16 @@ class LogTokenizer:
     
     def _tokenize_plain_text(self, text: str, offset: int) -> List[Token]:
         """Tokenize plain text (no brackets or quotes) by whitespace"""
-        tokens = []
-        
-        # Split by whitespace but keep track of positions
-        parts = re.split(r'(\s+)', text)
-        pos = offset
-        
-        for part in parts:
-            if not part:
-                continue
-            
-            if part.isspace():
-                tokens.append(Token(
-                    type=TokenType.WHITESPACE,
-                    value=part,
-                    start_pos=pos,
-                    end_pos=pos + len(part)
-                ))
-            elif self.NUMBER_PATTERN.fullmatch(part):
-                tokens.append(Token(
-                    type=TokenType.NUMBER,
-                    value=part,
-                    start_pos=pos,
-                    end_pos=pos + len(part)
-                ))
-            elif part in ',:;-':
-                tokens.append(Token(
-                    type=TokenType.PUNCTUATION,
-                    value=part,
-                    start_pos=pos,
-                    end_pos=pos + len(part)
-                ))
-            else:
-                tokens.append(Token(
-                    type=TokenType.WORD,
-                    value=part,
-                    start_pos=pos,
-                    end_pos=pos + len(part)
-                ))
-            
-            pos += len(part)
-        
-        return tokens
+        # One C-level scan splits and classifies each whitespace-separated run
+        return [
+            Token(
+                type=self._PLAIN_TOKEN_TYPES[match.lastgroup],
+                value=match.group(),
+                start_pos=offset + match.start(),
+                end_pos=offset + match.end()
+            )
+            for match in self.PLAIN_TEXT_PATTERN.finditer(text)
+        ]
     
     def get_fields(self, tokens: List[Token]) -> List[str]:
         """
@@ -12,12 +12,15 @@ This module compresses logs using schema-aware strategies:
 Target: 10-30x compression ratio while preserving query capability
 """
 
+import os
 import struct
-import json
+import mmap
 import gzip
+import threading
+import zlib
 import msgpack
 import zstandard as zstd
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass, field as dataclass_field
 from collections import defaultdict
 from pathlib import Path
@@ -37,15 +40,112 @@ from logpress.context.encoding.varint import (
 _UNIVERSAL_DICT = None
 _UNIVERSAL_DICT_PATH = Path(__file__).parent / "universal_dict.zstd"
 
-def load_universal_dict() -> Optional[bytes]:
-    """Load pre-trained universal Zstandard dictionary"""
+def load_universal_dict() -> Optional[Union[mmap.mmap, bytes]]:
+    """Load pre-trained universal Zstandard dictionary
+    
+    The file is memory-mapped read-only rather than read into a private
+    buffer, so parallel evaluation workers share one copy in the page cache.
+    
+    Returns:
+        The mapped dictionary file, the raw bytes if train_universal_dict()
+        replaced it in this process, or None when there is no dictionary
+    """
     global _UNIVERSAL_DICT
     if _UNIVERSAL_DICT is None and _UNIVERSAL_DICT_PATH.exists():
         with open(_UNIVERSAL_DICT_PATH, 'rb') as f:
-            _UNIVERSAL_DICT = f.read()
+            if f.seek(0, 2) > 0:
+                _UNIVERSAL_DICT = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
     return _UNIVERSAL_DICT
 
 
+# Reusable zstd contexts. They are not safe for concurrent use, so each
+# thread gets its own.
+_zstd_contexts = threading.local()
+
+def get_universal_contexts() -> Tuple[Optional[zstd.ZstdCompressor], Optional[zstd.ZstdDecompressor]]:
+    """Get cached (compressor, decompressor) for the universal dictionary
+    
+    Parsing the dictionary and preparing level-15 tables is not free, so the
+    contexts are shared by every save()/load() instead of rebuilt per file.
+    
+    Returns:
+        (ZstdCompressor, ZstdDecompressor), or (None, None) without a dictionary
+    """
+    universal_dict = load_universal_dict()
+    if universal_dict is None:
+        return None, None
+    cached = getattr(_zstd_contexts, 'universal', None)
+    if cached is None or cached[0] is not universal_dict:
+        zdict = zstd.ZstdCompressionDict(universal_dict)
+        zdict.precompute_compress(level=15)
+        cached = (universal_dict,
+                  zstd.ZstdCompressor(level=15, dict_data=zdict),
+                  zstd.ZstdDecompressor(dict_data=zdict))
+        _zstd_contexts.universal = cached
+    return cached[1], cached[2]
+
+
+def get_plain_compressor() -> zstd.ZstdCompressor:
+    """Get the cached level-15 ZstdCompressor used when no dictionary is available"""
+    cctx = getattr(_zstd_contexts, 'plain', None)
+    if cctx is None:
+        cctx = _zstd_contexts.plain = zstd.ZstdCompressor(level=15)
+    return cctx
+
+
+def get_plain_decompressor() -> zstd.ZstdDecompressor:
+    """Get the cached ZstdDecompressor for files written without a dictionary"""
+    dctx = getattr(_zstd_contexts, 'plain_d', None)
+    if dctx is None:
+        dctx = _zstd_contexts.plain_d = zstd.ZstdDecompressor()
+    return dctx
+
+
+def train_universal_dict(samples: List[bytes], dict_size: int = 64 * 1024,
+                         output_path: Path = _UNIVERSAL_DICT_PATH) -> bytes:
+    """Train the universal Zstandard dictionary shared across datasets
+    
+    Zstd dictionaries are trained on many small samples, so pass individual
+    log lines (or other small records) gathered from several datasets rather
+    than one concatenated corpus. The dictionary is tuned for level 15, the
+    level save() compresses at, with the fastCover parameter search spread
+    over all cores.
+    
+    Args:
+        samples: Training samples as bytes
+        dict_size: Maximum dictionary size in bytes (default: 64 KB)
+        output_path: Where to store the dictionary (default: universal_dict.zstd)
+        
+    Returns:
+        Raw dictionary bytes
+    """
+    global _UNIVERSAL_DICT
+    dict_bytes = zstd.train_dictionary(dict_size, samples, level=15, threads=-1).as_bytes()
+    
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # Other processes may have the current file mapped (load_universal_dict), so
+    # never truncate it in place: write a sibling temp file and swap it in atomically
+    tmp_path = output_path.with_name(f"{output_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(dict_bytes)
+    os.replace(tmp_path, output_path)
+    
+    # Make the new dictionary visible to save()/load() in this process
+    if output_path == _UNIVERSAL_DICT_PATH:
+        _UNIVERSAL_DICT = dict_bytes
+    
+    return dict_bytes
+
+
+# Template part kinds used by SemanticCompressor.decompress()
+_PART_CONSTANT = 0
+_PART_TIMESTAMP = 1
+_PART_SEVERITY = 2
+_PART_IP = 3
+_PART_MESSAGE = 4
+
+
 def zigzag_encode(n: int) -> int:
     """Zigzag encoding for signed integers: maps negatives to positive odds"""
     if n >= 0:
@@ -250,7 +350,7 @@ class CompressionStats:
                 f"time={self.compression_time:.2f}s, logs={self.log_count})")
 
 
-@dataclass
+@dataclass(slots=True)
 class CompressedLog:
     """Compressed log storage format for semantic-aware compression"""
     version: str = "1.0"
@@ -284,13 +384,47 @@ class CompressedLog:
     # Index: RLE-compressed template IDs + varint field indices
     log_index_templates_rle: bytes = b''  # RLE compressed template IDs
     log_index_fields_varint: bytes = b''  # Varint field indices (flat list)
-    log_index_field_counts: List[int] = dataclass_field(default_factory=list)  # Fields per log
+    log_index_field_counts: List[int] = dataclass_field(default_factory=list)  # Fields per log (RLE on disk)
     
     # Metadata
     original_count: int = 0
     compressed_at: str = ""
 
 
+# CompressedLog fields written as-is by save(); log_index_field_counts is stored RLE encoded
+_PACKED_FIELDS = (
+    'version', 'templates',
+    # v3.0: Token pool and Zstd dictionary
+    'token_pool', 'template_token_refs', 'zstd_dict',
+    # Varint-encoded fields (already bytes)
+    'timestamps_varint', 'timestamp_base', 'timestamp_count',
+    'severities_varint', 'severity_count',
+    'ip_addresses_varint', 'ip_count',
+    'messages_varint', 'message_count',
+    # Dictionaries as lists
+    'severity_list', 'ip_list', 'message_list',
+    # RLE + varint index
+    'log_index_templates_rle', 'log_index_fields_varint',
+    'original_count', 'compressed_at',
+)
+
+
+def to_packable_dict(cd: CompressedLog) -> Dict[str, Any]:
+    """
+    Build the MessagePack-ready dict of a CompressedLog
+    
+    Args:
+        cd: Compressed log to serialize
+        
+    Returns:
+        Dict of on-disk field names to values
+    """
+    output = {name: getattr(cd, name) for name in _PACKED_FIELDS}
+    # v3.5: Per-log field counts repeat per template, so store them RLE encoded
+    output['log_index_field_counts_rle'] = encode_rle(cd.log_index_field_counts)
+    return output
+
+
 class SemanticCompressor:
     """
     Semantic-aware log compressor
@@ -322,6 +456,7 @@ class SemanticCompressor:
                  enable_zstd: bool = True):
         self.generator = TemplateGenerator(min_support=min_support)
         self.compressed_data = None
+        self._last_packed = None
         
         # Ablation study flags
         self.enable_delta = enable_delta
@@ -365,7 +500,7 @@ class SemanticCompressor:
             print(f"  [2/6] Token Pool Deduplication (Global Template Optimization)...")
         
         compressed = CompressedLog()
-        compressed.version = '3.4'
+        compressed.version = '3.5'
         compressed.original_count = len(log_lines)
         compressed.compressed_at = datetime.now().isoformat()
         
@@ -377,8 +512,8 @@ class SemanticCompressor:
         if verbose:
             # Calculate actual character savings from deduplication
             total_pattern_chars = sum(len(' '.join(t.pattern)) for t in templates)
-            pool_chars = sum(len(token) for token in token_pool) + len(token_pool) - 1  # Include spaces
-            ref_bytes = sum(len(ref) for ref in compressed.template_token_refs)
+            pool_chars = sum(map(len, token_pool)) + len(token_pool) - 1  # Include spaces
+            ref_bytes = sum(map(len, compressed.template_token_refs))
             savings = total_pattern_chars - (pool_chars + ref_bytes)
             print(f"     ✓ Algorithm: Global token pool deduplication")
             if savings > 0:
@@ -410,7 +545,12 @@ class SemanticCompressor:
         severities_list = []
         ips_list = []
         messages_list = []
-        log_index = []
+        
+        # Log index kept as parallel columns (template id, flat field indices,
+        # field count per log) rather than per-log tuples
+        template_ids = []
+        all_field_indices = []
+        field_counts = []
         
         matched_count = 0
         
@@ -418,24 +558,33 @@ class SemanticCompressor:
         if verbose:
             print(f"  [3/6] Matching and collecting fields...")
         
-        for log_line in log_lines:
-            result = self.generator.match_log_to_template(log_line)
+        # Template ID -> position lookup (first occurrence wins)
+        template_positions = {}
+        for i, t in enumerate(templates):
+            template_positions.setdefault(t.template_id, i)
+        
+        # Reuse the fields tokenized during schema extraction
+        log_fields = self.generator.log_fields
+        for log_line, fields in zip(log_lines, log_fields):
+            if fields is not None:
+                result = self.generator.match_fields_to_template(fields)
+            else:
+                result = self.generator.match_log_to_template(log_line)
             
             if not result:
                 # Store unmatched log as full message
                 msg_id = self._get_or_create_id(log_line, message_map)
                 messages_list.append(msg_id)
-                log_index.append((-1, [len(messages_list) - 1]))  # -1 = no template
+                template_ids.append(-1)  # -1 = no template
+                all_field_indices.append(len(messages_list) - 1)
+                field_counts.append(1)
                 continue
             
             template, fields = result
             matched_count += 1
             
             # Find template index
-            template_idx = next(
-                (i for i, t in enumerate(templates) if t.template_id == template.template_id),
-                0
-            )
+            template_idx = template_positions.get(template.template_id, 0)
             
             # Compress fields based on semantic type
             field_indices = []
@@ -475,7 +624,12 @@ class SemanticCompressor:
                     messages_list.append(msg_id)
                     field_indices.append(len(messages_list) - 1)
             
-            log_index.append((template_idx, field_indices))
+            template_ids.append(template_idx)
+            all_field_indices.extend(field_indices)
+            field_counts.append(len(field_indices))
+        
+        # Cached fields are only needed for matching; release them
+        self.generator.log_fields = []
         
         # Step 4: Apply varint encoding to all integer arrays
         if verbose:
@@ -515,18 +669,10 @@ class SemanticCompressor:
         if verbose:
             print(f"  [5/6] RLE v2 Compression (Pattern Detection)...")
         
-        template_ids = [idx[0] for idx in log_index]
         # Apply zigzag encoding to handle negative template IDs (-1 for unmatched)
         zigzag_template_ids = [zigzag_encode(tid) for tid in template_ids]
         compressed.log_index_templates_rle = encode_rle_v2(zigzag_template_ids)
         
-        # Flatten field indices and store counts
-        all_field_indices = []
-        field_counts = []
-        for _, field_indices in log_index:
-            all_field_indices.extend(field_indices)
-            field_counts.append(len(field_indices))
-        
         compressed.log_index_fields_varint = encode_varint_list(all_field_indices)
         compressed.log_index_field_counts = field_counts
         
@@ -551,8 +697,8 @@ class SemanticCompressor:
             valid_messages = [msg for msg in compressed.message_list[:1000] if msg and isinstance(msg, str)]
             
             if len(valid_messages) >= 50:
-                corpus = '\n'.join(valid_messages)
-                samples = [corpus.encode('utf-8')]
+                # Join as bytes directly; no intermediate str copy of the corpus
+                samples = [b'\n'.join(msg.encode('utf-8') for msg in valid_messages)]
                 
                 # Train 20KB dictionary
                 try:
@@ -571,7 +717,8 @@ class SemanticCompressor:
             compressed.zstd_dict = None
         
         # Calculate statistics
-        original_size = sum(len(log.encode('utf-8')) for log in log_lines)
+        # map() keeps the per-line encode in C; no joined copy of the batch is built
+        original_size = sum(map(len, map(str.encode, log_lines)))
         compressed_size = self._estimate_compressed_size(compressed)
         
         compression_time = time.time() - start_time
@@ -595,6 +742,7 @@ class SemanticCompressor:
             print(f"  • Dictionaries: severity={len(severity_map)}, ip={len(ip_map)}, message={len(message_map)}")
         
         self.compressed_data = compressed
+        self._last_packed = None  # packed form of the previous batch is stale now
         return compressed, stats
     
     def _parse_timestamp(self, ts_str: str) -> int:
@@ -643,8 +791,8 @@ class SemanticCompressor:
         """Estimate compressed data size in bytes (for varint format)"""
         size = 0
         
-        # Templates (still JSON)
-        size += len(json.dumps(compressed.templates).encode('utf-8'))
+        # Templates, sized as save() stores them (MessagePack)
+        size += len(msgpack.packb(compressed.templates, use_bin_type=True))
         
         # Varint-encoded fields (already bytes)
         size += len(compressed.timestamps_varint)
@@ -653,7 +801,7 @@ class SemanticCompressor:
         size += len(compressed.messages_varint)
         
         # Dictionaries as lists
-        size += len(json.dumps(compressed.severity_list).encode('utf-8'))
+        size += len(msgpack.packb(compressed.severity_list, use_bin_type=True))
         
         # IP list (dictionary encoding)
         ip_list_size = 0
@@ -680,65 +828,37 @@ class SemanticCompressor:
         
         return size
     
-    def save(self, filepath: Path, verbose: bool = False, use_bwt: bool = False):
-        """Save optimized compressed data (varint + RLE + MessagePack + [BWT] + zstd)
+    def _pack_output(self, cd: CompressedLog) -> bytes:
+        """MessagePack-serialize the on-disk fields of a CompressedLog"""
+        return msgpack.packb(to_packable_dict(cd), use_bin_type=True)
+    
+    def _encode(self, verbose: bool = False, use_bwt: bool = False,
+                bwt_workers: int = 1) -> Tuple[bytes, bytes, bytes]:
+        """
+        Serialize the current compressed data (MessagePack + optional BWT + zstd)
         
-        Args:
-            filepath: Output file path
-            verbose: Print compression statistics
-            use_bwt: Apply Burrows-Wheeler Transform before Zstd (default: False)
-                    BWT achieves 28.10x avg compression (+79.7% vs baseline)
-                    but adds ~2s processing time per 5K logs
+        The packed MessagePack buffer is kept as `_last_packed` until the next
+        compress(), so saving the same batch again (e.g. with and without BWT)
+        only redoes the steps after packing.
+        
+        Returns:
+            (msgpack bytes, bytes fed to zstd, final compressed bytes)
         """
         if not self.compressed_data:
             raise ValueError("No compressed data to save")
         
+        msgpack_data = self._last_packed
+        if msgpack_data is None:
+            msgpack_data = self._last_packed = self._pack_output(self.compressed_data)
         cd = self.compressed_data
         
-        output = {
-            'version': cd.version,
-            'templates': cd.templates,
-            
-            # v3.0: Token pool and Zstd dictionary
-            'token_pool': cd.token_pool,
-            'template_token_refs': cd.template_token_refs,
-            'zstd_dict': cd.zstd_dict,
-            
-            # Varint-encoded fields (already bytes)
-            'timestamps_varint': cd.timestamps_varint,
-            'timestamp_base': cd.timestamp_base,
-            'timestamp_count': cd.timestamp_count,
-            'severities_varint': cd.severities_varint,
-            'severity_count': cd.severity_count,
-            'ip_addresses_varint': cd.ip_addresses_varint,
-            'ip_count': cd.ip_count,
-            'messages_varint': cd.messages_varint,
-            'message_count': cd.message_count,
-            
-            # Dictionaries as lists
-            'severity_list': cd.severity_list,
-            'ip_list': cd.ip_list,
-            'message_list': cd.message_list,
-            
-            # RLE + varint index
-            'log_index_templates_rle': cd.log_index_templates_rle,
-            'log_index_fields_varint': cd.log_index_fields_varint,
-            'log_index_field_counts': cd.log_index_field_counts,
-            
-            'original_count': cd.original_count,
-            'compressed_at': cd.compressed_at
-        }
-        
-        # MessagePack + optional BWT + zstd with trained dictionary
-        msgpack_data = msgpack.packb(output, use_bin_type=True)
-        
         # Apply BWT preprocessing if requested
         if use_bwt:
             if verbose:
                 print(f"   Applying BWT preprocessing...")
             import time
             start = time.time()
-            data_to_compress = bwt_transform(msgpack_data, block_size=256*1024)
+            data_to_compress = bwt_transform(msgpack_data, block_size=256*1024, workers=bwt_workers)
             bwt_time = time.time() - start
             if verbose:
                 print(f"   BWT: {len(msgpack_data):,} → {len(data_to_compress):,} bytes ({bwt_time:.2f}s)")
@@ -746,15 +866,13 @@ class SemanticCompressor:
             data_to_compress = msgpack_data
         
         # Try to use universal dictionary first (trained from all datasets)
-        universal_dict = load_universal_dict()
+        universal_cctx, _ = get_universal_contexts()
         
-        if universal_dict:
+        if universal_cctx:
             # Use universal dictionary (better for cross-dataset compression)
-            zdict = zstd.ZstdCompressionDict(universal_dict)
-            cctx = zstd.ZstdCompressor(level=15, dict_data=zdict)
-            compressed = cctx.compress(data_to_compress)
+            compressed = universal_cctx.compress(data_to_compress)
             if verbose:
-                print(f"   Using universal Zstd dictionary ({len(universal_dict):,} bytes)")
+                print(f"   Using universal Zstd dictionary ({len(load_universal_dict()):,} bytes)")
         elif cd.zstd_dict:
             # Fallback to per-batch trained dictionary
             zdict = zstd.ZstdCompressionDict(cd.zstd_dict)
@@ -764,57 +882,90 @@ class SemanticCompressor:
                 print(f"   Using per-batch Zstd dictionary ({len(cd.zstd_dict):,} bytes)")
         else:
             # No dictionary available
-            compressed = zstd.compress(data_to_compress, level=15)
+            compressed = get_plain_compressor().compress(data_to_compress)
             if verbose:
                 print(f"   Using Zstd without dictionary")
         
+        return msgpack_data, data_to_compress, compressed
+    
+    def to_bytes(self, use_bwt: bool = False, bwt_workers: int = 1) -> bytes:
+        """
+        Return the compressed data exactly as save() would write it
+        
+        Args:
+            use_bwt: Apply Burrows-Wheeler Transform before Zstd
+            bwt_workers: Processes for BWT blocks when use_bwt is set
+        """
+        return self._encode(use_bwt=use_bwt, bwt_workers=bwt_workers)[2]
+    
+    def save(self, filepath: Path, verbose: bool = False, use_bwt: bool = False,
+             bwt_workers: int = 1) -> int:
+        """Save optimized compressed data (varint + RLE + MessagePack + [BWT] + zstd)
+        
+        Args:
+            filepath: Output file path
+            verbose: Print compression statistics
+            use_bwt: Apply Burrows-Wheeler Transform before Zstd (default: False)
+                    BWT achieves 28.10x avg compression (+79.7% vs baseline)
+                    but adds ~2s processing time per 5K logs
+            bwt_workers: Processes for BWT blocks (256 KB each) when use_bwt is set
+        
+        Returns:
+            Number of bytes written (the compressed file size)
+        """
+        msgpack_data, data_to_compress, compressed = self._encode(verbose, use_bwt, bwt_workers)
+        
         filepath.parent.mkdir(parents=True, exist_ok=True)
         with open(filepath, 'wb') as f:
             f.write(compressed)
         
-        print(f"💾 Saved optimized compressed data to {filepath}")
-        print(f"   MessagePack size: {len(msgpack_data):,} bytes ({len(msgpack_data)/1024:.1f} KB)")
-        if use_bwt:
-            print(f"   After BWT: {len(data_to_compress):,} bytes ({len(data_to_compress)/1024:.1f} KB)")
-        print(f"   Final size: {len(compressed):,} bytes ({len(compressed)/1024:.1f} KB)")
-        print(f"   Zstd ratio: {len(data_to_compress) / len(compressed):.2f}x")
-        print(f"   Overall ratio: {len(msgpack_data) / len(compressed):.2f}x")
+        # Benchmarks save every dataset with verbose=False, so the report is opt-in
+        if verbose:
+            print(f"💾 Saved optimized compressed data to {filepath}")
+            print(f"   MessagePack size: {len(msgpack_data):,} bytes ({len(msgpack_data)/1024:.1f} KB)")
+            if use_bwt:
+                print(f"   After BWT: {len(data_to_compress):,} bytes ({len(data_to_compress)/1024:.1f} KB)")
+            print(f"   Final size: {len(compressed):,} bytes ({len(compressed)/1024:.1f} KB)")
+            print(f"   Zstd ratio: {len(data_to_compress) / len(compressed):.2f}x")
+            print(f"   Overall ratio: {len(msgpack_data) / len(compressed):.2f}x")
+        
+        return len(compressed)
     
     @staticmethod
-    def load(filepath: Path, use_bwt: bool = False) -> CompressedLog:
+    def load(filepath: Path, use_bwt: bool = False, bwt_workers: int = 1) -> CompressedLog:
         """Load compressed data from file (zstd -> [BWT inverse] -> MessagePack -> varint/RLE decode)
         
         Args:
             filepath: Input file path
             use_bwt: Apply BWT inverse after Zstd decompression (default: False)
                     Set to True if file was compressed with use_bwt=True
+            bwt_workers: Processes for BWT inverse blocks when use_bwt is set
         """
-        with open(filepath, 'rb') as f:
-            compressed_bytes = f.read()
-        
-        # Try decompression with universal dictionary first
-        universal_dict = load_universal_dict()
-        
-        if universal_dict:
-            try:
-                zdict = zstd.ZstdCompressionDict(universal_dict)
-                dctx = zstd.ZstdDecompressor(dict_data=zdict)
-                decompressed = dctx.decompress(compressed_bytes)
-            except:
-                # Fallback to no dictionary
-                decompressed = zstd.decompress(compressed_bytes)
-        else:
-            # Try new format first (single zstd layer)
-            try:
-                decompressed = zstd.decompress(compressed_bytes)
-            except:
-                # Fallback: try old format (zstd -> gzip)
-                gzipped = zstd.decompress(compressed_bytes)
-                decompressed = gzip.decompress(gzipped)
+        # Decompress straight from a read-only mapping of the file, so the
+        # compressed bytes are never copied into a Python buffer first
+        with open(filepath, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as compressed_bytes:
+            # Try decompression with universal dictionary first
+            _, universal_dctx = get_universal_contexts()
+            
+            if universal_dctx:
+                try:
+                    decompressed = universal_dctx.decompress(compressed_bytes)
+                except:
+                    # Fallback to no dictionary
+                    decompressed = get_plain_decompressor().decompress(compressed_bytes)
+            else:
+                # Try new format first (single zstd layer)
+                try:
+                    decompressed = get_plain_decompressor().decompress(compressed_bytes)
+                except:
+                    # Fallback: try old format (zstd -> gzip)
+                    gzipped = get_plain_decompressor().decompress(compressed_bytes)
+                    decompressed = gzip.decompress(gzipped)
         
         # Apply BWT inverse if needed
         if use_bwt:
-            msgpack_data = bwt_inverse(decompressed)
+            msgpack_data = bwt_inverse(decompressed, workers=bwt_workers)
         else:
             msgpack_data = decompressed
         
@@ -834,7 +985,7 @@ class SemanticCompressor:
         compressed.templates = data['templates']
         
         # v3.0+: Load token pool and reconstruct patterns
-        if compressed.version in ['3.0', '3.1', '3.2', '3.3', '3.4']:
+        if compressed.version in ['3.0', '3.1', '3.2', '3.3', '3.4', '3.5']:
             compressed.token_pool = data.get('token_pool', [])
             compressed.template_token_refs = data.get('template_token_refs', [])
             compressed.zstd_dict = data.get('zstd_dict', None)
@@ -880,7 +1031,12 @@ class SemanticCompressor:
             
             compressed.log_index_templates_rle = data.get('log_index_templates_rle', b'')
             compressed.log_index_fields_varint = data.get('log_index_fields_varint', b'')
-            compressed.log_index_field_counts = data.get('log_index_field_counts', [])
+            if 'log_index_field_counts_rle' in data:
+                compressed.log_index_field_counts = decode_rle(
+                    data['log_index_field_counts_rle'], data['original_count']
+                )
+            else:
+                compressed.log_index_field_counts = data.get('log_index_field_counts', [])
         else:
             # Old format - would need conversion (not implemented for now)
             raise ValueError(f"Unsupported format version {compressed.version}. Please re-compress with new version.")
@@ -956,6 +1112,7 @@ class SemanticCompressor:
         
         logs = []
         current_ts = compressed.timestamp_base if compressed.timestamp_base else 0
+        template_plans = {}
         
         for log_idx, (template_idx, field_indices) in enumerate(zip(template_ids, log_index)):
             if template_idx == -1:
@@ -964,52 +1121,78 @@ class SemanticCompressor:
                 logs.append(compressed.message_list[msg_id])
                 continue
             
-            # Get template
-            template_data = compressed.templates[template_idx]
-            pattern = template_data['pattern']
-            field_types = template_data['field_types']  # Maps pattern position → field type
+            # Get template reconstruction plan (built once per template)
+            plan = template_plans.get(template_idx)
+            if plan is None:
+                plan = self._build_reconstruction_plan(compressed.templates[template_idx])
+                template_plans[template_idx] = plan
             
-            # Reconstruct log by iterating through pattern
+            # Reconstruct log by iterating through the plan
             reconstructed = []
             field_idx = 0  # Index into field_indices array
             
-            for pos, part in enumerate(pattern):
-                if part.startswith('[') and part.endswith(']'):
-                    # Variable field - check if this position has a field
-                    if pos in field_types and field_idx < len(field_indices):
-                        field_type_str = field_types[pos]
-                        actual_idx = field_indices[field_idx]
-                        
-                        # Look up value in appropriate array based on field type
-                        if field_type_str == 'timestamp':
-                            if actual_idx < len(timestamps):
-                                delta = timestamps[actual_idx]
-                                current_ts += delta
-                                reconstructed.append(str(current_ts))
-                        elif field_type_str in ('severity', 'status'):
-                            if actual_idx < len(severities):
-                                sev_id = severities[actual_idx]
-                                if sev_id < len(compressed.severity_list):
-                                    reconstructed.append(compressed.severity_list[sev_id])
-                        elif field_type_str in ('ip_address', 'host'):
-                            if actual_idx < len(ip_addresses):
-                                ip_id = ip_addresses[actual_idx]
-                                if ip_id < len(compressed.ip_list):
-                                    reconstructed.append(compressed.ip_list[ip_id])
-                        else:  # message or other types
-                            if actual_idx < len(messages):
-                                msg_id = messages[actual_idx]
-                                if msg_id < len(compressed.message_list):
-                                    reconstructed.append(compressed.message_list[msg_id])
-                        
-                        field_idx += 1
-                else:
+            for kind, value in plan:
+                if kind == _PART_CONSTANT:
                     # Constant part - use as-is
-                    reconstructed.append(part)
+                    reconstructed.append(value)
+                    continue
+                
+                if field_idx >= len(field_indices):
+                    continue
+                actual_idx = field_indices[field_idx]
+                
+                # Look up value in appropriate array based on field type
+                if kind == _PART_TIMESTAMP:
+                    if actual_idx < len(timestamps):
+                        delta = timestamps[actual_idx]
+                        current_ts += delta
+                        reconstructed.append(str(current_ts))
+                elif kind == _PART_SEVERITY:
+                    if actual_idx < len(severities):
+                        sev_id = severities[actual_idx]
+                        if sev_id < len(compressed.severity_list):
+                            reconstructed.append(compressed.severity_list[sev_id])
+                elif kind == _PART_IP:
+                    if actual_idx < len(ip_addresses):
+                        ip_id = ip_addresses[actual_idx]
+                        if ip_id < len(compressed.ip_list):
+                            reconstructed.append(compressed.ip_list[ip_id])
+                else:  # message or other types
+                    if actual_idx < len(messages):
+                        msg_id = messages[actual_idx]
+                        if msg_id < len(compressed.message_list):
+                            reconstructed.append(compressed.message_list[msg_id])
+                
+                field_idx += 1
             
             logs.append(' '.join(str(part) for part in reconstructed))
         
         return logs
+    
+    @staticmethod
+    def _build_reconstruction_plan(template_data: Dict) -> List[Tuple[int, str]]:
+        """Resolve a template into (part kind, value) steps for decompression
+        
+        Constant parts keep their literal value. Variable parts become the
+        column they are read from; variable parts without a stored field
+        type produce no output and are dropped from the plan.
+        """
+        field_types = template_data['field_types']  # Maps pattern position → field type
+        plan = []
+        for pos, part in enumerate(template_data['pattern']):
+            if not (part.startswith('[') and part.endswith(']')):
+                plan.append((_PART_CONSTANT, part))
+            elif pos in field_types:
+                field_type_str = field_types[pos]
+                if field_type_str == 'timestamp':
+                    plan.append((_PART_TIMESTAMP, field_type_str))
+                elif field_type_str in ('severity', 'status'):
+                    plan.append((_PART_SEVERITY, field_type_str))
+                elif field_type_str in ('ip_address', 'host'):
+                    plan.append((_PART_IP, field_type_str))
+                else:
+                    plan.append((_PART_MESSAGE, field_type_str))
+        return plan
 
 
 # CLI for compression benchmarking
@@ -1021,19 +1204,30 @@ if __name__ == "__main__":
     parser.add_argument('--output', required=True, help='Output compressed file')
     parser.add_argument('--sample-size', type=int, default=None, help='Number of logs to compress')
     parser.add_argument('--measure', action='store_true', help='Compare with gzip')
+    parser.add_argument('--train-dict', nargs='+', metavar='LOG',
+                        help='Train the universal Zstd dictionary from these log files first')
     
     args = parser.parse_args()
     
-    # Load logs
+    if args.train_dict:
+        from logpress.services.sampling import reservoir_sample
+        
+        # Up to 10K lines per dataset keeps the dictionary representative of all of them.
+        # Reservoir sampling draws them from the whole file, not just its head,
+        # while holding only the sample in memory.
+        samples = []
+        for log_path in args.train_dict:
+            with open(log_path, 'rb', buffering=1 << 20) as f:
+                samples.extend(line.strip() for line in reservoir_sample(f, 10000, seed=42))
+        dict_bytes = train_universal_dict(samples)
+        print(f"📚 Trained universal Zstd dictionary: {len(dict_bytes):,} bytes from {len(samples):,} lines")
+    
+    # Load logs (islice stops reading once --sample-size non-blank lines are found)
+    from itertools import islice
+    
     print(f"📂 Loading logs from {args.input}")
-    logs = []
     with open(args.input, 'r', encoding='utf-8', errors='ignore') as f:
-        for i, line in enumerate(f):
-            if args.sample_size and i >= args.sample_size:
-                break
-            line = line.strip()
-            if line:
-                logs.append(line)
+        logs = list(islice(filter(None, map(str.strip, f)), args.sample_size))
     
     print(f"✓ Loaded {len(logs)} logs\n")
     
@@ -1043,22 +1237,50 @@ if __name__ == "__main__":
     
     # Save
     output_path = Path(args.output)
-    compressor.save(output_path)
+    actual_file_size = compressor.save(output_path, verbose=True)
     
     # Compare with gzip if requested
     if args.measure:
-        print(f"\n📊 Comparison with gzip:")
-        import gzip
+        print(f"\n📊 Comparison with gzip and zstd:")
         
-        original_data = '\n'.join(logs).encode('utf-8')
-        gzipped = gzip.compress(original_data, compresslevel=9)
-        
-        actual_file_size = output_path.stat().st_size
-        
-        print(f"  • Original: {len(original_data):,} bytes")
-        print(f"  • logpress:   {actual_file_size:,} bytes ({len(original_data)/actual_file_size:.2f}x)")
-        print(f"  • gzip -9:  {len(gzipped):,} bytes ({len(original_data)/len(gzipped):.2f}x)")
-        print(f"  • logpress advantage: {len(gzipped)/actual_file_size:.2f}x better than gzip")
+        # When logpress used the universal dictionary, give zstd the same dictionary
+        # so the comparison isolates the gain from the columnar encoding
+        universal_dict = load_universal_dict()
+        dict_obj = None
+        if universal_dict is not None:
+            dict_obj = zstd.ZstdCompressor(
+                level=3, dict_data=zstd.ZstdCompressionDict(universal_dict), threads=-1
+            ).compressobj()
+        
+        # Stream lines through gzip and zstd instead of materializing '\n'.join(logs);
+        # only output sizes are counted, so no compressed buffer is kept either
+        original_size = 0
+        gzip_size = 0
+        zstd_size = 0
+        zstd_dict_size = 0
+        gzip_obj = zlib.compressobj(9, zlib.DEFLATED, 31)  # wbits=31: gzip container, mtime 0
+        # zstd -3 reference, spread over all cores
+        zstd_obj = zstd.ZstdCompressor(level=3, threads=-1).compressobj()
+        for i, log in enumerate(logs):
+            line = log.encode('utf-8') if i == 0 else b'\n' + log.encode('utf-8')
+            original_size += len(line)
+            gzip_size += len(gzip_obj.compress(line))
+            zstd_size += len(zstd_obj.compress(line))
+            if dict_obj:
+                zstd_dict_size += len(dict_obj.compress(line))
+        gzip_size += len(gzip_obj.flush())
+        zstd_size += len(zstd_obj.flush())
+        if dict_obj:
+            zstd_dict_size += len(dict_obj.flush())
+        
+        print(f"  • Original: {original_size:,} bytes")
+        print(f"  • logpress:   {actual_file_size:,} bytes ({original_size/actual_file_size:.2f}x)")
+        print(f"  • gzip -9:  {gzip_size:,} bytes ({original_size/gzip_size:.2f}x)")
+        print(f"  • zstd -3:  {zstd_size:,} bytes ({original_size/zstd_size:.2f}x)")
+        if dict_obj:
+            print(f"  • zstd -3 + universal dict: {zstd_dict_size:,} bytes ({original_size/zstd_dict_size:.2f}x)")
+        print(f"  • logpress advantage: {gzip_size/actual_file_size:.2f}x better than gzip, "
+              f"{zstd_size/actual_file_size:.2f}x better than zstd")
 
 
 if __name__ == "__main__":
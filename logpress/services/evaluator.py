@@ -12,6 +12,8 @@ from typing import Dict, List, Set, Tuple
 from dataclasses import dataclass, asdict
 import argparse
 
+from logpress.services.json_io import write_json
+
 
 @dataclass
 class FieldAnnotation:
@@ -299,8 +301,7 @@ def create_sample_ground_truth(output_path: Path):
     }
     
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, 'w') as f:
-        json.dump(annotations, f, indent=2)
+    write_json(output_path, annotations, pretty=True)
     
     print(f"✓ Created sample ground truth: {output_path}")
 
@@ -332,8 +333,7 @@ def main():
     
     # Save metrics to file
     output_path = args.extracted.parent / 'evaluation_metrics.json'
-    with open(output_path, 'w') as f:
-        json.dump(metrics.to_dict(), f, indent=2)
+    write_json(output_path, metrics.to_dict(), pretty=True)
     print(f"\n💾 Metrics saved to: {output_path}")
 
 
@@ -7,17 +7,68 @@ These metrics validate schema extraction quality without manual labeling:
 3. Template Stability: Similarity between independent extraction runs
 """
 
+import contextlib
+import io
 import re
-import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional, Set, Callable
 from collections import defaultdict
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from logpress.services.json_io import write_json
+
+
+def load_log_lines(dataset_path: str) -> List[str]:
+    """
+    Load non-blank log lines (line endings removed, other whitespace kept).
+    
+    Streams the file (newline='' keeps the line endings so they can be
+    stripped exactly), which avoids holding the whole text next to the lines.
+    """
+    with open(dataset_path, 'r', encoding='utf-8', errors='ignore', newline='',
+              buffering=1 << 20) as f:
+        return [line.rstrip('\r\n') for line in f if not line.isspace()]
+
+
+def _index_templates_by_length(templates: List) -> Dict[int, Dict[Tuple[int, ...], Set[Tuple[str, ...]]]]:
+    """
+    Build a sparse index of templates keyed by token count.
+    
+    Each template is reduced to the positions and values of its constant
+    tokens; variable positions ([TYPE] placeholders) match anything and are
+    dropped. Templates sharing the same constant positions are merged into
+    one set of constant-value tuples, so a log is checked with one hash
+    lookup per distinct position layout instead of one scan per template.
+    """
+    index = defaultdict(lambda: defaultdict(set))
+    for template in templates:
+        # Access pattern attribute directly (LogTemplate is a dataclass)
+        pattern = template.pattern if hasattr(template, 'pattern') else []
+        constants = [
+            (pos, part) for pos, part in enumerate(pattern)
+            if not (part.startswith('[') and part.endswith(']'))
+        ]
+        positions = tuple(pos for pos, _ in constants)
+        index[len(pattern)][positions].add(tuple(part for _, part in constants))
+    return index
+
+
+def _constant_getter(positions: Tuple[int, ...]) -> Callable[[List[str]], Tuple[str, ...]]:
+    """Return a function extracting the tokens at `positions` as a tuple"""
+    if len(positions) > 1:
+        return itemgetter(*positions)
+    if positions:
+        pos = positions[0]
+        return lambda tokens: (tokens[pos],)
+    return lambda tokens: ()
+
 
 def calculate_template_coverage(templates: List, logs: List[str]) -> Tuple[float, int, int]:
     """
@@ -30,24 +81,23 @@ def calculate_template_coverage(templates: List, logs: List[str]) -> Tuple[float
     Returns:
         Tuple of (coverage percentage, matched count, total count)
     """
+    # Templates are indexed once so each log is only compared against
+    # templates with the same token count, on their constant positions only
+    index = {
+        length: [(_constant_getter(positions), values) for positions, values in layouts.items()]
+        for length, layouts in _index_templates_by_length(templates).items()
+    }
+    
     matched = 0
     for log in logs:
         tokens = log.split()
-        for template in templates:
-            # Access pattern attribute directly (LogTemplate is a dataclass)
-            pattern = template.pattern if hasattr(template, 'pattern') else []
-            if len(tokens) == len(pattern):
-                # Simple matching: check if variable positions align
-                match = True
-                for token, pattern_part in zip(tokens, pattern):
-                    if not (pattern_part.startswith('[') and pattern_part.endswith(']')):
-                        # Constant token - must match exactly
-                        if token != pattern_part:
-                            match = False
-                            break
-                if match:
-                    matched += 1
-                    break
+        candidates = index.get(len(tokens))
+        if not candidates:
+            continue
+        for get_constants, values in candidates:
+            if get_constants(tokens) in values:
+                matched += 1
+                break
     
     coverage = matched / len(logs) if logs else 0.0
     return coverage, matched, len(logs)
@@ -164,29 +214,38 @@ def calculate_field_type_consistency(logs: List[str], templates: List) -> Dict[s
     return results
 
 
-def calculate_template_stability(dataset_path: str, num_runs: int = 3) -> Tuple[float, Dict]:
+def calculate_template_stability(
+    dataset_path: str,
+    num_runs: int = 3,
+    logs: Optional[List[str]] = None,
+    templates: Optional[List] = None
+) -> Tuple[float, Dict]:
     """
     Run template extraction multiple times and measure similarity.
     
     Args:
         dataset_path: Path to log file
         num_runs: Number of independent extraction runs (default 3)
+        logs: Already loaded log lines (read from dataset_path if None)
+        templates: Templates from a previous extraction over `logs`,
+            reused as the first run instead of extracting again
         
     Returns:
         Tuple of (Jaccard similarity, detailed stats)
     """
-    from logpress.template_generator import TemplateGenerator
+    from logpress.context.extraction.template_generator import TemplateGenerator
     
     # Load logs once
-    with open(dataset_path, 'r', encoding='utf-8', errors='ignore') as f:
-        logs = [line.rstrip('\n\r') for line in f if line.strip()]
+    if logs is None:
+        logs = load_log_lines(dataset_path)
     
     template_sets = []
     template_counts = []
     
     for run in range(num_runs):
-        generator = TemplateGenerator()
-        templates = generator.extract_schemas(logs)
+        if run > 0 or templates is None:
+            generator = TemplateGenerator()
+            templates = generator.extract_schemas(logs)
         
         # Create signature for each template (pattern as tuple)
         signatures = set()
@@ -221,18 +280,19 @@ def calculate_template_stability(dataset_path: str, num_runs: int = 3) -> Tuple[
     return avg_similarity, stats
 
 
-def run_intrinsic_evaluation(dataset_path: str, output_path: str = None) -> Dict:
+def run_intrinsic_evaluation(dataset_path: str, output_path: str = None, pretty: bool = False) -> Dict:
     """
     Run all intrinsic metrics on a dataset.
     
     Args:
         dataset_path: Path to log file
         output_path: Optional path to save JSON results
+        pretty: Indent the saved JSON (compact by default)
         
     Returns:
         Dict with all evaluation metrics
     """
-    from logpress.template_generator import TemplateGenerator
+    from logpress.context.extraction.template_generator import TemplateGenerator
     
     dataset_name = Path(dataset_path).parent.name
     print(f"\n{'='*80}")
@@ -241,8 +301,7 @@ def run_intrinsic_evaluation(dataset_path: str, output_path: str = None) -> Dict
     
     # Load logs
     print(f"📂 Loading logs from {dataset_path}")
-    with open(dataset_path, 'r', encoding='utf-8', errors='ignore') as f:
-        logs = [line.rstrip('\n\r') for line in f if line.strip()]
+    logs = load_log_lines(dataset_path)
     print(f"✓ Loaded {len(logs):,} logs\n")
     
     # Extract templates
@@ -261,7 +320,9 @@ def run_intrinsic_evaluation(dataset_path: str, output_path: str = None) -> Dict
     
     # Metric 3: Template Stability
     print("🔄 Measuring template stability (3 independent runs)...")
-    stability, stability_stats = calculate_template_stability(dataset_path, num_runs=3)
+    stability, stability_stats = calculate_template_stability(
+        dataset_path, num_runs=3, logs=logs, templates=templates
+    )
     print(f"✓ Stability: {stability:.1%} (Jaccard similarity)")
     print(f"  • Template counts: {stability_stats['template_counts']}")
     print(f"  • Average: {stability_stats['avg_templates']:.1f} templates\n")
@@ -292,8 +353,7 @@ def run_intrinsic_evaluation(dataset_path: str, output_path: str = None) -> Dict
     if output_path:
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        write_json(output_file, results, pretty=pretty)
         print(f"💾 Results saved to {output_path}\n")
     
     # Print summary
@@ -308,9 +368,29 @@ def run_intrinsic_evaluation(dataset_path: str, output_path: str = None) -> Dict
     return results
 
 
+def _run_intrinsic_evaluation_buffered(dataset_path: str, output_path: str, pretty: bool = False) -> Dict:
+    """
+    Run one evaluation and write its console output as a single block.
+    
+    Used by main() so output from parallel workers does not interleave
+    line by line (template extraction prints progress too).
+    """
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            return run_intrinsic_evaluation(dataset_path, output_path, pretty)
+    finally:
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+
+
 def main():
     """Run intrinsic evaluation on all datasets"""
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Run intrinsic schema extraction metrics")
+    parser.add_argument('--pretty', action='store_true', help='Indent JSON result files')
+    args = parser.parse_args()
     
     datasets = [
         "datasets/Apache/Apache_full.log",
@@ -319,8 +399,7 @@ def main():
         "datasets/Zookeeper/Zookeeper_full.log"
     ]
     
-    all_results = []
-    
+    jobs = []
     for dataset in datasets:
         dataset_path = Path(dataset)
         if not dataset_path.exists():
@@ -329,14 +408,28 @@ def main():
         
         dataset_name = dataset_path.parent.name
         output_path = f"results/intrinsic_{dataset_name.lower()}.json"
+        jobs.append((dataset_name, str(dataset_path), output_path))
+    
+    if not jobs:
+        return
+    
+    all_results = []
+    # Datasets are independent and CPU-bound, so evaluate them in parallel
+    max_workers = min(len(jobs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            (dataset_name, executor.submit(_run_intrinsic_evaluation_buffered, dataset_path, output_path, args.pretty))
+            for dataset_name, dataset_path, output_path in jobs
+        ]
         
-        try:
-            results = run_intrinsic_evaluation(str(dataset_path), output_path)
-            all_results.append(results)
-        except Exception as e:
-            print(f"❌ Error evaluating {dataset_name}: {e}")
-            import traceback
-            traceback.print_exc()
+        # Collect in submission order so the summary table stays stable
+        for dataset_name, future in futures:
+            try:
+                all_results.append(future.result())
+            except Exception as e:
+                print(f"❌ Error evaluating {dataset_name}: {e}")
+                import traceback
+                traceback.print_exc()
     
     # Generate summary table
     if all_results:
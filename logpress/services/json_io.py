@@ -0,0 +1,32 @@
+"""
+JSON output helpers shared by the services and evaluation scripts.
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+# Optional: orjson serializes results much faster than the stdlib encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def write_json(path: Path, data: Any, pretty: bool = False) -> None:
+    """
+    Write JSON results, compact by default.
+
+    Uses orjson when installed (bytes written directly), falling back to
+    the stdlib json module. Indentation is only added when `pretty` is set.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        Path(path).write_bytes(orjson.dumps(data, option=option))
+    else:
+        with open(path, 'w') as f:
+            if pretty:
+                json.dump(data, f, indent=2)
+            else:
+                json.dump(data, f, separators=(',', ':'))
@@ -12,6 +12,7 @@ Uses columnar indexes for fast filtering
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass
 from pathlib import Path
+import heapq
 import time
 
 from logpress.services.compressor import CompressedLog, SemanticCompressor
@@ -26,6 +27,11 @@ class QueryResult:
     execution_time: float
     scanned_count: int
     
+    @property
+    def throughput(self) -> float:
+        """Scanned entries per second (inf when the query was too fast to time)"""
+        return self.scanned_count / self.execution_time if self.execution_time > 0 else float('inf')
+    
     def __repr__(self):
         return (f"QueryResult(matched={self.matched_count}, "
                 f"scanned={self.scanned_count}, time={self.execution_time:.4f}s)")
@@ -41,6 +47,7 @@ class QueryEngine:
     
     def __init__(self, compressed_path: Optional[Path] = None):
         self.compressed = None
+        self._decompressor = None  # Created on first reconstruction, then reused
         if compressed_path:
             self.load(compressed_path)
     
@@ -71,8 +78,9 @@ class QueryEngine:
         
         # Use the compressor's decompress method
         # Pass the compressed data we loaded
-        compressor = SemanticCompressor()
-        all_logs = compressor.decompress(self.compressed)
+        if self._decompressor is None:
+            self._decompressor = SemanticCompressor()
+        all_logs = self._decompressor.decompress(self.compressed)
         
         # Return only matched indices
         return [all_logs[i] for i in indices if i < len(all_logs)]
@@ -296,27 +304,35 @@ class QueryEngine:
         if not self.compressed:
             raise ValueError("No compressed data loaded")
         
+        severities = []
+        if self.compressed.severities_varint:
+            severities = decode_varint_list(
+                self.compressed.severities_varint,
+                self.compressed.severity_count
+            )
+        
         return {
             'total_logs': self.compressed.original_count,
             'templates': len(self.compressed.templates),
-            'unique_severities': len(self.compressed.severity_dict),
-            'unique_ips': len(self.compressed.ip_dict),
-            'unique_messages': len(self.compressed.message_dict),
+            'unique_severities': len(self.compressed.severity_list),
+            'unique_ips': len(self.compressed.ip_list),
+            'unique_messages': len(self.compressed.message_list),
             'top_severities': self._get_top_values(
-                self.compressed.severities,
-                self.compressed.severity_dict
+                severities,
+                dict(enumerate(self.compressed.severity_list))
             ),
+            # Partial heap selection instead of sorting every template
             'top_templates': [
                 {
                     'id': t['id'],
                     'pattern': ' '.join(t['pattern'][:5]) + '...',
                     'matches': t['match_count']
                 }
-                for t in sorted(
+                for t in heapq.nlargest(
+                    5,
                     self.compressed.templates,
-                    key=lambda x: x['match_count'],
-                    reverse=True
-                )[:5]
+                    key=lambda x: x['match_count']
+                )
             ]
         }
     
@@ -382,7 +398,7 @@ if __name__ == "__main__":
         print(f"Matched: {result.matched_count} logs")
         print(f"Scanned: {result.scanned_count} entries")
         print(f"Query time: {result.execution_time:.6f}s")
-        print(f"Speed: {result.scanned_count/result.execution_time:,.0f} entries/sec")
+        print(f"Speed: {result.throughput:,.0f} entries/sec")
     
     elif args.query == 'ip':
         if not args.value:
@@ -394,4 +410,4 @@ if __name__ == "__main__":
         print(f"Matched: {result.matched_count} logs")
         print(f"Scanned: {result.scanned_count} entries")
         print(f"Query time: {result.execution_time:.6f}s")
-        print(f"Speed: {result.scanned_count/result.execution_time:,.0f} entries/sec")
+        print(f"Speed: {result.throughput:,.0f} entries/sec")
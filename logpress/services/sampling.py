@@ -0,0 +1,46 @@
+"""
+Log sampling helpers shared by the services and evaluation scripts.
+"""
+
+import math
+import random
+from itertools import islice
+from typing import Iterable, List, Optional
+
+
+def reservoir_sample(lines: Iterable[str], k: int, seed: Optional[int] = None) -> List[str]:
+    """
+    Uniformly sample k non-empty lines in a single pass (Algorithm L).
+    
+    Works on any iterable, including an open file, so only k lines are
+    kept in memory. Sampled lines are returned in their original order.
+    
+    Args:
+        lines: Log lines (list, generator or file object)
+        k: Sample size
+        seed: Optional seed for reproducible samples
+        
+    Returns:
+        Up to k sampled lines
+    """
+    if k <= 0:
+        return []
+    
+    rng = random.Random(seed)
+    # isspace() tests blank lines without allocating a stripped copy of each line
+    numbered = enumerate(line for line in lines if line and not line.isspace())
+    reservoir = list(islice(numbered, k))
+    
+    if len(reservoir) == k:
+        w = math.exp(math.log(rng.random()) / k)
+        while True:
+            # Skip ahead a geometrically distributed number of lines
+            skip = math.floor(math.log(rng.random()) / math.log(1 - w))
+            item = next(islice(numbered, skip, None), None)
+            if item is None:
+                break
+            reservoir[rng.randrange(k)] = item
+            w *= math.exp(math.log(rng.random()) / k)
+    
+    reservoir.sort()
+    return [line for _, line in reservoir]
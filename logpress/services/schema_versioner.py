@@ -15,6 +15,8 @@ from pathlib import Path
 from datetime import datetime
 import hashlib
 
+from logpress.services.json_io import write_json
+
 
 @dataclass
 class SchemaVersion:
@@ -278,8 +280,7 @@ class SchemaVersioner:
         """Save evolution history to disk"""
         filepath = self.storage_dir / f"{evolution.source_name}.json"
         
-        with open(filepath, 'w') as f:
-            json.dump(evolution.to_dict(), f, indent=2)
+        write_json(filepath, evolution.to_dict(), pretty=True)
     
     def print_evolution_summary(self, source_name: str):
         """Print evolution summary for a source"""
@@ -4,7 +4,10 @@ Integration tests for compression workflow
 
 import pytest
 from pathlib import Path
-from logpress.services.compressor import SemanticCompressor
+from dataclasses import fields
+import mmap
+import pickle
+from logpress.services.compressor import SemanticCompressor, CompressedLog, to_packable_dict, train_universal_dict
 
 class TestCompressionWorkflow:
     """Test end-to-end compression workflow"""
@@ -30,6 +33,64 @@ class TestCompressionWorkflow:
         assert output_file.exists()
         assert output_file.stat().st_size > 0
     
+    def test_to_bytes_matches_saved_file(self, test_output_dir, sample_logs):
+        """Test that to_bytes returns the saved file contents and keeps the packed buffer"""
+        compressor = SemanticCompressor(min_support=2)
+        output_file = test_output_dir / "compressed" / "to_bytes.lsc"
+        
+        compressor.compress(sample_logs, verbose=False)
+        size = compressor.save(output_file, verbose=False)
+        packed = compressor._last_packed
+        
+        assert compressor.to_bytes() == output_file.read_bytes()
+        assert len(output_file.read_bytes()) == size
+        assert compressor._last_packed is packed
+    
+    def test_packed_buffer_reset_by_compress(self, sample_logs):
+        """Test that a new compress() call invalidates the cached packed buffer"""
+        compressor = SemanticCompressor(min_support=2)
+        
+        compressor.compress(sample_logs, verbose=False)
+        compressor.to_bytes()
+        first = compressor._last_packed
+        compressor.compress(sample_logs[:2], verbose=False)
+        
+        assert compressor._last_packed is None
+        compressor.to_bytes()
+        assert compressor._last_packed is not first
+    
+    def test_compressor_is_picklable(self, sample_logs):
+        """Test that a used compressor survives a pickle round trip (e.g. for process pools)"""
+        compressor = SemanticCompressor(min_support=2)
+        compressor.compress(sample_logs, verbose=False)
+        
+        restored = pickle.loads(pickle.dumps(compressor))
+        
+        assert restored.to_bytes() == compressor.to_bytes()
+    
+    def test_packable_dict_covers_every_field(self):
+        """Test that every CompressedLog field is written, field counts RLE encoded"""
+        packed = to_packable_dict(CompressedLog())
+        
+        expected = {f.name for f in fields(CompressedLog)} - {'log_index_field_counts'}
+        assert set(packed) == expected | {'log_index_field_counts_rle'}
+    
+    def test_train_dict_replaces_mapped_file(self, tmp_path):
+        """Test that retraining swaps the file in, leaving existing mappings intact"""
+        dict_path = tmp_path / "universal_dict.zstd"
+        dict_path.write_bytes(b"old dictionary")
+        samples = [f"2024-01-01 10:00:{i % 60:02d} INFO worker-{i % 7} handled request {i}".encode()
+                   for i in range(2000)]
+        
+        with open(dict_path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        dict_bytes = train_universal_dict(samples, dict_size=4096, output_path=dict_path)
+        
+        assert mapped[:] == b"old dictionary"
+        assert dict_path.read_bytes() == dict_bytes
+        assert [p.name for p in tmp_path.iterdir()] == ["universal_dict.zstd"]
+        mapped.close()
+    
     def test_compress_multiple_datasets(self, test_data_dir, test_output_dir):
         """Test compressing multiple datasets sequentially"""
         compressor = SemanticCompressor(min_support=2)
@@ -0,0 +1,48 @@
+"""
+Integration tests for querying compressed logs
+"""
+
+import pytest
+from logpress.services.compressor import SemanticCompressor
+from logpress.services.query_engine import QueryEngine
+
+class TestQueryStatistics:
+    """Test statistics over a saved compressed file"""
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        logs = [
+            f"2024-01-01 10:00:{i:02d} {'ERROR' if i % 3 == 0 else 'INFO'} worker {i % 4} finished job"
+            for i in range(30)
+        ] + [f"2024-01-01 10:01:{i:02d} INFO cache miss" for i in range(10)]
+
+        compressor = SemanticCompressor(min_support=2)
+        compressor.compress(logs, verbose=False)
+        compressed_file = tmp_path / "stats.lsc"
+        compressor.save(compressed_file)
+
+        return QueryEngine(compressed_file)
+
+    def test_statistics_counts(self, engine):
+        """Test that totals and dictionary sizes come from the loaded columns"""
+        stats = engine.get_statistics()
+
+        assert stats['total_logs'] == 40
+        assert stats['templates'] == 2
+        assert stats['unique_severities'] == 2
+
+    def test_top_severities_are_decoded(self, engine):
+        """Test that severity IDs are mapped back to their values, most common first"""
+        stats = engine.get_statistics()
+
+        assert stats['top_severities'] == [
+            {'value': 'INFO', 'count': 30},
+            {'value': 'ERROR', 'count': 10},
+        ]
+
+    def test_top_templates_by_match_count(self, engine):
+        """Test that templates are listed by descending match count"""
+        stats = engine.get_statistics()
+
+        assert [t['matches'] for t in stats['top_templates']] == [30, 10]
+        assert all(t['pattern'].endswith('...') for t in stats['top_templates'])
@@ -0,0 +1,87 @@
+"""
+Unit tests for the Burrows-Wheeler Transform
+"""
+
+import random
+import numpy as np
+import pytest
+from logpress.context.encoding import bwt
+from logpress.context.encoding.bwt import bwt_transform, bwt_transform_many, bwt_inverse, _bwt_encode_block
+
+
+class TestBWT:
+    """Test BWT encoding and round-trips"""
+
+    def test_known_block(self):
+        """Test the classic banana example"""
+        assert _bwt_encode_block(b"banana") == (b"nnbaaa", 3)
+
+    @pytest.mark.parametrize("data", [
+        b"",
+        b"x",
+        b"x" * 300,
+        b"banana" * 43,
+        b"abcabcabcabd" * 50,
+        bytes(range(256)) * 3,
+    ])
+    def test_round_trip(self, data):
+        """Test that inverse(transform(data)) restores data, including periodic blocks"""
+        assert bwt_inverse(bwt_transform(data, block_size=256)) == data
+
+    def test_round_trip_random_logs(self):
+        """Test a multi-block round-trip on log-like data"""
+        rng = random.Random(7)
+        data = "\n".join(
+            f"2024-01-01 10:00:{i % 60:02d} INFO worker-{rng.randint(1, 9)} done in {rng.randint(1, 999)}ms"
+            for i in range(500)
+        ).encode()
+
+        assert bwt_inverse(bwt_transform(data, block_size=4096)) == data
+
+    def test_parallel_blocks_match_serial(self):
+        """Test that transforming blocks in worker processes gives the same bytes"""
+        data = b"INFO request served in 12ms\n" * 400
+
+        serial = bwt_transform(data, block_size=2048)
+        parallel = bwt_transform(data, block_size=2048, workers=2)
+
+        assert parallel == serial
+        assert bwt_inverse(parallel, workers=2) == data
+
+    def test_transform_many_matches_single_buffers(self):
+        """Test that batching buffers through one pool gives per-buffer results"""
+        buffers = [b"", b"banana" * 43, b"INFO request served in 12ms\n" * 100, b"x"]
+
+        expected = [bwt_transform(data, block_size=256) for data in buffers]
+
+        assert bwt_transform_many(buffers, block_size=256) == expected
+        assert bwt_transform_many(buffers, block_size=256, workers=2) == expected
+
+
+
+def _reference_divsufsort(data):
+    """Suffix array by plain sorting, standing in for pydivsufsort"""
+    return np.array(sorted(range(len(data)), key=lambda i: data[i:]))
+
+
+class TestRotationSortBackends:
+    """Test that both rotation sorts give the same BWT"""
+
+    @pytest.mark.parametrize("block", [
+        b"ab" * 1000,
+        b"abcabcabcabd" * 5,
+        b"x" * 64,
+        b"banana",
+        bytes(range(256)) * 2,
+    ], ids=["ab-period", "abcabd-period", "single-byte", "banana", "all-bytes-period"])
+    def test_suffix_array_matches_prefix_doubling(self, block, monkeypatch):
+        """Test identical output, including the tie order of equal rotations in periodic blocks"""
+        monkeypatch.setattr(bwt, "PYDIVSUFSORT_AVAILABLE", False)
+        expected = _bwt_encode_block(block)
+
+        monkeypatch.setattr(bwt, "divsufsort", _reference_divsufsort, raising=False)
+        monkeypatch.setattr(bwt, "PYDIVSUFSORT_AVAILABLE", True)
+        encoded = _bwt_encode_block(block)
+
+        assert encoded == expected
+        assert bwt_inverse(bwt_transform(block, block_size=len(block))) == block
@@ -0,0 +1,56 @@
+"""
+Unit tests for intrinsic evaluation metrics
+"""
+
+import pytest
+from logpress.context.extraction.template_generator import LogTemplate
+from logpress.services.intrinsic_metrics import calculate_template_coverage, load_log_lines
+
+class TestTemplateCoverage:
+    """Test template coverage calculation"""
+
+    def _template(self, template_id, pattern):
+        return LogTemplate(template_id=template_id, pattern=pattern, field_types={})
+
+    def test_coverage_matches_constants_and_variables(self):
+        """Test that constant tokens must match and variable tokens match anything"""
+        templates = [
+            self._template("T000", ["[TIMESTAMP]", "LDAP:", "Built"]),
+            self._template("T001", ["[TIMESTAMP]", "error", "[FIELD]", "channel"]),
+        ]
+        logs = [
+            "06:07:04 LDAP: Built",
+            "06:07:05 error creating channel",
+            "06:07:05 error creating socket",
+            "06:07:19 Apache configured",
+        ]
+
+        coverage, matched, total = calculate_template_coverage(templates, logs)
+
+        assert matched == 2
+        assert total == 4
+        assert coverage == pytest.approx(0.5)
+
+    def test_coverage_requires_equal_token_count(self):
+        """Test that logs with a different token count never match"""
+        templates = [self._template("T000", ["[FIELD]", "[FIELD]"])]
+
+        _, matched, _ = calculate_template_coverage(templates, ["a", "a b", "a b c"])
+
+        assert matched == 1
+
+    def test_coverage_empty_inputs(self):
+        """Test coverage with no logs or no templates"""
+        assert calculate_template_coverage([], []) == (0.0, 0, 0)
+        assert calculate_template_coverage([], ["a b"]) == (0.0, 0, 1)
+
+
+class TestLoadLogLines:
+    """Test dataset loading"""
+
+    def test_skips_blank_lines_and_keeps_inner_whitespace(self, tmp_path):
+        """Test that blank lines are dropped and only line endings are removed"""
+        log_file = tmp_path / "sample.log"
+        log_file.write_bytes(b"a b \r\n\r\n  \n\tc\nd")
+
+        assert load_log_lines(log_file) == ["a b ", "\tc", "d"]
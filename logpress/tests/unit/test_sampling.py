@@ -0,0 +1,29 @@
+"""
+Unit tests for log sampling
+"""
+
+from logpress.services.sampling import reservoir_sample
+
+
+class TestReservoirSample:
+    """Test single-pass log sampling"""
+
+    def test_sample_smaller_than_k_returns_all_lines(self):
+        """Test that short inputs are returned whole, without empty lines"""
+        assert reservoir_sample(["a", "", "b", "c"], 10) == ["a", "b", "c"]
+
+    def test_sample_size_and_order(self):
+        """Test that k lines are kept in their original order"""
+        lines = (f"log {i}" for i in range(10000))
+
+        sample = reservoir_sample(lines, 100, seed=42)
+
+        assert len(sample) == 100
+        assert len(set(sample)) == 100
+        assert sample == sorted(sample, key=lambda line: int(line.split()[1]))
+
+    def test_sample_is_reproducible_with_seed(self):
+        """Test that the same seed yields the same sample"""
+        lines = [f"log {i}" for i in range(1000)]
+
+        assert reservoir_sample(lines, 50, seed=7) == reservoir_sample(lines, 50, seed=7)
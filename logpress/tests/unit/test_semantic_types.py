@@ -0,0 +1,94 @@
+"""
+Unit tests for semantic type recognition
+"""
+
+import pickle
+import re
+import pytest
+from logpress.context.classification.semantic_types import SemanticTypeRecognizer, SemanticType, SemanticMatch
+
+
+@pytest.fixture(scope="module")
+def recognizer():
+    return SemanticTypeRecognizer()
+
+
+class TestGetBestMatch:
+    """Test the early-exit best match lookup"""
+
+    @pytest.mark.parametrize("value", [
+        "2024-11-23 10:15:32",
+        "192.168.1.1",
+        "ERROR",
+        "Step_LSC",
+        "30002312",
+        "nova.compute.manager",
+        "[req-7a738b84-d574-43c6-a6c4-68c164365101]",
+        "0.54 seconds",
+        "proxy.cse.cuhk.edu.hk:5070",
+        "connection started",
+        "plain words only",
+    ])
+    def test_matches_first_recognize_result(self, recognizer, value):
+        """Test that the best match equals the top-ranked recognize() result"""
+        expected = recognizer.recognize(value)[0]
+        best = recognizer.get_best_match(value)
+
+        assert (best.type, best.value, best.confidence, best.pattern_name) == \
+            (expected.type, expected.value, expected.confidence, expected.pattern_name)
+
+    def test_empty_value_is_unknown(self, recognizer):
+        """Test that blank values are reported as UNKNOWN"""
+        assert recognizer.get_best_match("   ").type == SemanticType.UNKNOWN
+
+    def test_batch_matches_single_lookups(self, recognizer):
+        """Test that batch lookup agrees with per-value lookup, repeats included"""
+        values = ["ERROR", "192.168.1.1", "ERROR", "plain words only", "", "ERROR"]
+
+        batch = recognizer.get_best_matches(values)
+
+        assert [(m.type, m.value, m.confidence) for m in batch] == \
+            [(m.type, m.value, m.confidence) for m in map(recognizer.get_best_match, values)]
+
+    def test_repeated_lookups_are_cached(self):
+        """Test that a repeated value is only scanned once"""
+        recognizer = SemanticTypeRecognizer()
+
+        first = recognizer.get_best_match("ERROR")
+        second = recognizer.get_best_match("ERROR")
+
+        assert second is first
+        assert list(recognizer._best_match_cache) == ["ERROR"]
+
+    def test_recognizer_is_picklable(self, recognizer):
+        """Test that a recognizer with a warm cache survives a pickle round trip"""
+        recognizer.get_best_match("ERROR")
+
+        restored = pickle.loads(pickle.dumps(recognizer))
+
+        assert restored.get_best_match("ERROR").type == SemanticType.SEVERITY
+        assert restored.get_best_match("192.168.1.1").type == SemanticType.IP_ADDRESS
+
+    def test_context_is_accepted(self, recognizer):
+        """Test that callers may still pass context, which does not change the result"""
+        assert recognizer.get_best_match("ERROR", context={"position": 2}).type == SemanticType.SEVERITY
+
+    def test_patterns_added_after_construction_are_honored(self):
+        """Test that the early exit uses the current pattern confidences"""
+        recognizer = SemanticTypeRecognizer()
+        recognizer.action_patterns.append((re.compile(r'192\.168\.1\.1'), 0.99, "custom_ip"))
+
+        assert recognizer.get_best_match("192.168.1.1").pattern_name == "custom_ip"
+
+    def test_overridden_recognize_is_used(self):
+        """Test that a subclass overriding recognize() is not bypassed"""
+        class CustomRecognizer(SemanticTypeRecognizer):
+            def recognize(self, field_value, context=None):
+                return [SemanticMatch(type=SemanticType.USER_ID, value=field_value,
+                                      confidence=1.0, pattern_name="custom")]
+
+        recognizer = CustomRecognizer()
+
+        assert recognizer.get_best_match("ERROR").type == SemanticType.USER_ID
+        assert [m.type for m in recognizer.get_best_matches(["ERROR", "192.168.1.1"])] == \
+            [SemanticType.USER_ID, SemanticType.USER_ID]
@@ -0,0 +1,57 @@
+"""
+Unit tests for log tokenization
+"""
+
+import pytest
+from logpress.context.tokenization.tokenizer import LogTokenizer, TokenType
+
+
+@pytest.fixture(scope="module")
+def tokenizer():
+    return LogTokenizer()
+
+
+class TestPlainTextTokens:
+    """Test whitespace splitting and token classification of plain text"""
+
+    def test_runs_are_classified(self, tokenizer):
+        """Test numbers, punctuation, words and whitespace with their offsets"""
+        tokens = tokenizer._tokenize_plain_text("took 12.5 ms -  ok:", 10)
+
+        assert [(t.type, t.value, t.start_pos, t.end_pos) for t in tokens] == [
+            (TokenType.WORD, "took", 10, 14),
+            (TokenType.WHITESPACE, " ", 14, 15),
+            (TokenType.NUMBER, "12.5", 15, 19),
+            (TokenType.WHITESPACE, " ", 19, 20),
+            (TokenType.WORD, "ms", 20, 22),
+            (TokenType.WHITESPACE, " ", 22, 23),
+            (TokenType.PUNCTUATION, "-", 23, 24),
+            (TokenType.WHITESPACE, "  ", 24, 26),
+            (TokenType.WORD, "ok:", 26, 29),
+        ]
+
+    @pytest.mark.parametrize("value, expected", [
+        ("42", TokenType.NUMBER),
+        ("1.2.3", TokenType.WORD),
+        ("5.", TokenType.WORD),
+        (":;", TokenType.PUNCTUATION),
+        (",;", TokenType.WORD),
+        ("--", TokenType.WORD),
+    ])
+    def test_whole_run_decides_type(self, tokenizer, value, expected):
+        """Test that a run is only a number or punctuation if all of it is"""
+        assert [t.type for t in tokenizer._tokenize_plain_text(value, 0)] == [expected]
+
+
+class TestSpecialTokens:
+    """Test bracket and quoted-string extraction"""
+
+    def test_quotes_inside_brackets_stay_in_bracket(self, tokenizer):
+        """Test that a quote starting inside a bracket is not split out"""
+        tokens = tokenizer.tokenize("[user 'bob'] said 'hi'")
+
+        assert [(t.type, t.value, t.start_pos, t.end_pos)
+                for t in tokens if t.type in (TokenType.BRACKET, TokenType.QUOTED)] == [
+            (TokenType.BRACKET, "[user 'bob']", 0, 12),
+            (TokenType.QUOTED, "'hi'", 18, 22),
+        ]